@@ -1,19 +1,116 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
 from .models import (
     Genre,
+    Job,
     Actor,
     Ticket,
     TheatreHall,
     Play,
     Reservation,
     Performance,
+    PriceTier,
 )
 
-admin.site.register(TheatreHall)
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Page unfiltered changelists of big PostgreSQL tables with the planner's
+    row estimate instead of a full COUNT(*).
+    """
+
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql" and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return row[0]
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class PriceTierInline(admin.TabularInline):
+    model = PriceTier
+    extra = 0
+
+
+class TicketInline(admin.TabularInline):
+    model = Ticket
+    extra = 0
+    raw_id_fields = ("performance",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("performance")
+
+
+@admin.register(Play)
+class PlayAdmin(admin.ModelAdmin):
+    search_fields = ("title",)
+
+
+@admin.register(TheatreHall)
+class TheatreHallAdmin(admin.ModelAdmin):
+    list_display = ("name", "rows", "seats_in_row")
+    search_fields = ("name",)
+
+
+@admin.register(Performance)
+class PerformanceAdmin(LargeTableAdmin):
+    list_display = ("id", "play", "theatre_hall", "show_time", "queued_booking")
+    list_select_related = ("play", "theatre_hall")
+    list_filter = ("theatre_hall", "queued_booking")
+    autocomplete_fields = ("play", "theatre_hall")
+    date_hierarchy = "show_time"
+    inlines = (PriceTierInline,)
+
+
+@admin.register(Reservation)
+class ReservationAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "created_at")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    inlines = (TicketInline,)
+
+
+@admin.register(Ticket)
+class TicketAdmin(LargeTableAdmin):
+    list_display = ("id", "performance", "row", "seat", "reservation_id")
+    raw_id_fields = ("performance", "reservation")
+
+    def get_queryset(self, request):
+        # Changelist and change page both label tickets by their performance
+        return super().get_queryset(request).select_related("performance")
+
+
+@admin.register(Job)
+class JobAdmin(LargeTableAdmin):
+    list_display = ("id", "task", "status", "run_at", "attempts", "duration")
+    list_filter = ("status", "task")
+    readonly_fields = (
+        "result",
+        "error",
+        "started_at",
+        "heartbeat_at",
+        "finished_at",
+        "duration",
+    )
+
+
 admin.site.register(Genre)
 admin.site.register(Actor)
-admin.site.register(Play)
-admin.site.register(Performance)
-admin.site.register(Reservation)
-admin.site.register(Ticket)
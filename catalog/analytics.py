@@ -0,0 +1,139 @@
+from django.db import transaction
+from django.db.models import Count, F, Max, Sum
+from django.utils import timezone
+
+from catalog.models import (
+    ArchivedTicket,
+    Performance,
+    PerformanceSales,
+    RollupWatermark,
+    Ticket,
+)
+
+SALES_WATERMARK = "performance_sales"
+# Ticket ids are assigned at insert but become visible at commit, so a slow
+# transaction can commit ids below the watermark: incremental runs re-scan
+# this many ids below it.
+SALES_RESCAN_WINDOW = 1000
+
+# Each grouping adds model fields and annotated display columns.
+GROUPINGS = {
+    "performance": (
+        ("performance_id",),
+        {"show_time": F("performance__show_time")},
+    ),
+    "play": (("play_id",), {"play_title": F("play__title")}),
+    "theatre_hall": (
+        ("theatre_hall_id",),
+        {"theatre_hall_name": F("theatre_hall__name")},
+    ),
+    "day": ((), {"day": F("date")}),
+}
+
+
+def _ticket_counts(model, performance_ids):
+    return dict(
+        model.objects.filter(performance_id__in=performance_ids)
+        .order_by()
+        .values_list("performance_id")
+        .annotate(Count("id"))
+    )
+
+
+def rebuild_performance_sales(performance_ids):
+    """
+    Recompute the rollup rows of the given performances with one grouped
+    count per ticket table instead of counting performance by performance.
+    """
+    performances = (
+        Performance.objects.filter(id__in=performance_ids)
+        .order_by()
+        .values_list("id", "play_id", "theatre_hall_id", "show_time")
+        .annotate(capacity=F("theatre_hall__seat_count"))
+    )
+    live = _ticket_counts(Ticket, performance_ids)
+    archived = _ticket_counts(ArchivedTicket, performance_ids)
+
+    rows = [
+        PerformanceSales(
+            performance_id=performance_id,
+            play_id=play_id,
+            theatre_hall_id=theatre_hall_id,
+            date=timezone.localdate(show_time),
+            tickets_sold=live.get(performance_id, 0) + archived.get(performance_id, 0),
+            capacity=capacity,
+        )
+        for performance_id, play_id, theatre_hall_id, show_time, capacity in performances
+    ]
+    PerformanceSales.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["performance"],
+        update_fields=["play", "theatre_hall", "date", "tickets_sold", "capacity"],
+    )
+    return len(rows)
+
+
+def refresh_sales(full=False, batch_size=1000, rescan=SALES_RESCAN_WINDOW):
+    """
+    Bring the sales rollup up to date. Incremental runs only touch
+    performances that sold tickets since the watermark (less `rescan` ids
+    for late commits) or have no rollup row yet; a full run (backfill,
+    reschedules, cancelled reservations) rebuilds every performance.
+    """
+    watermark, _ = RollupWatermark.objects.get_or_create(name=SALES_WATERMARK)
+    high = max(Ticket.objects.aggregate(Max("id"))["id__max"] or 0, watermark.value)
+
+    if full:
+        performance_ids = list(
+            Performance.objects.order_by("id").values_list("id", flat=True)
+        )
+    else:
+        performance_ids = sorted(
+            set(
+                Ticket.objects.filter(
+                    id__gt=max(watermark.value - rescan, 0), id__lte=high
+                )
+                .order_by()
+                .values_list("performance_id", flat=True)
+                .distinct()
+            ).union(
+                Performance.objects.filter(sales__isnull=True)
+                .order_by()
+                .values_list("id", flat=True)
+            )
+        )
+
+    refreshed = 0
+    for start in range(0, len(performance_ids), batch_size):
+        with transaction.atomic():
+            refreshed += rebuild_performance_sales(
+                performance_ids[start : start + batch_size]
+            )
+
+    RollupWatermark.objects.filter(name=SALES_WATERMARK).update(value=high)
+    return refreshed
+
+
+def sales_report(group_by, date_from=None, date_to=None):
+    """Tickets sold and seats offered of the rollup rows, grouped by `group_by`"""
+    fields, expressions = [], {}
+    for name in group_by:
+        fields.extend(GROUPINGS[name][0])
+        expressions.update(GROUPINGS[name][1])
+
+    queryset = PerformanceSales.objects.all()
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+
+    return (
+        queryset.values(*fields, **expressions)
+        .annotate(
+            performances=Count("performance"),
+            tickets_sold=Sum("tickets_sold"),
+            capacity=Sum("capacity"),
+        )
+        .order_by(*fields, *expressions)
+    )
@@ -0,0 +1,170 @@
+import time
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from catalog.bookings import rebuild_booking_summaries
+from catalog.models import (
+    BookingRequest,
+    Performance,
+    Reservation,
+    Ticket,
+    WorkerLease,
+)
+from catalog.schedule import schedule_refresh
+from catalog.seat_events import publish_seat_change
+
+# WorkerLease held by the worker of a performance
+WORKER_LOCK_NAME = "booking_queue:{performance_id}"
+
+
+def enqueue_booking(user, performance, tickets):
+    """Queue validated ticket data of one queued-booking performance"""
+    return BookingRequest.objects.create(
+        user=user,
+        performance=performance,
+        seats=[[ticket["row"], ticket["seat"]] for ticket in tickets],
+    )
+
+
+class SeatMap:
+    """Occupancy bitmap of a performance, one byte per seat"""
+
+    def __init__(self, performance):
+        hall = performance.theatre_hall
+        self.rows = hall.rows
+        self.seats_in_row = hall.seats_in_row
+        self.taken = bytearray(self.rows * self.seats_in_row)
+        # Gaps of the hall layout count as taken seats
+        for row, mask in enumerate(hall.seat_layout.masks, start=1):
+            for seat in range(1, self.seats_in_row + 1):
+                if not mask >> (seat - 1) & 1:
+                    self.taken[self.offset(row, seat)] = 1
+        for row, seat in Ticket.objects.filter(performance=performance).values_list(
+            "row", "seat"
+        ):
+            self.taken[self.offset(row, seat)] = 1
+
+    def offset(self, row, seat):
+        return (row - 1) * self.seats_in_row + seat - 1
+
+    def claim(self, seats):
+        """Mark all seats taken, or none if any of them isn't free"""
+        offsets = set()
+        for row, seat in seats:
+            if not (1 <= row <= self.rows and 1 <= seat <= self.seats_in_row):
+                return False
+            offsets.add(self.offset(row, seat))
+        if len(offsets) != len(seats) or any(self.taken[o] for o in offsets):
+            return False
+        for offset in offsets:
+            self.taken[offset] = 1
+        return True
+
+
+def _process_batch(performance, seat_map, batch):
+    accepted = []
+    for booking in batch:
+        if seat_map.claim(booking.seats):
+            booking.status = BookingRequest.CONFIRMED
+            accepted.append(booking)
+        else:
+            booking.status = BookingRequest.REJECTED
+            booking.error = "Some of the seats are already taken."
+        booking.processed_at = timezone.now()
+
+    with transaction.atomic():
+        reservations = Reservation.objects.bulk_create(
+            Reservation(user_id=booking.user_id) for booking in accepted
+        )
+        Ticket.objects.bulk_create(
+            Ticket(row=row, seat=seat, performance=performance, reservation=reservation)
+            for booking, reservation in zip(accepted, reservations)
+            for row, seat in booking.seats
+        )
+        for booking, reservation in zip(accepted, reservations):
+            booking.reservation = reservation
+        BookingRequest.objects.bulk_update(
+            batch, ["status", "reservation", "error", "processed_at"]
+        )
+        if accepted:
+            schedule_refresh([performance.id])
+            publish_seat_change(
+                performance.id,
+                [seat for booking in accepted for seat in booking.seats],
+            )
+            transaction.on_commit(
+                partial(
+                    rebuild_booking_summaries,
+                    [booking.user_id for booking in accepted],
+                )
+            )
+
+
+def process_booking_queue(performance_id, batch_size=500, heartbeat=None):
+    """
+    Assign seats to the pending requests of a performance in arrival order
+    against an in-memory seat map, committing each batch at once. Only one
+    worker may run per performance (see run_booking_queue); `heartbeat` is
+    called after each batch to keep its lock.
+    """
+    performance = Performance.objects.select_related("theatre_hall").get(
+        id=performance_id
+    )
+    seat_map = SeatMap(performance)
+    pending = BookingRequest.objects.filter(
+        performance=performance, status=BookingRequest.PENDING
+    ).order_by("id")
+
+    processed = 0
+    reloaded = False
+    while batch := list(pending[:batch_size]):
+        try:
+            _process_batch(performance, seat_map, batch)
+        except IntegrityError:
+            # A ticket was booked outside the queue: the batch rolled back
+            # and is still pending, retry it once against fresh occupancy.
+            if reloaded:
+                raise
+            seat_map = SeatMap(performance)
+            reloaded = True
+            continue
+        processed += len(batch)
+        reloaded = False
+        if heartbeat is not None:
+            heartbeat()
+    return processed
+
+
+def acquire_worker_lock(performance_id, timeout):
+    """
+    Take the lease on a performance's queue for `timeout` seconds, unless
+    another worker holds it. The lease is a database row, so it holds across
+    processes and hosts, also behind pgbouncer (no session advisory locks).
+    """
+    name = WORKER_LOCK_NAME.format(performance_id=performance_id)
+    now = int(time.time())
+    if WorkerLease.objects.filter(name=name, expires_at__lte=now).update(
+        expires_at=now + timeout
+    ):
+        return True
+    try:
+        with transaction.atomic():
+            WorkerLease.objects.create(name=name, expires_at=now + timeout)
+    except IntegrityError:
+        return False
+    return True
+
+
+def extend_worker_lock(performance_id, timeout):
+    """Renew the lease held by this worker for another `timeout` seconds"""
+    WorkerLease.objects.filter(
+        name=WORKER_LOCK_NAME.format(performance_id=performance_id)
+    ).update(expires_at=int(time.time()) + timeout)
+
+
+def release_worker_lock(performance_id):
+    WorkerLease.objects.filter(
+        name=WORKER_LOCK_NAME.format(performance_id=performance_id)
+    ).delete()
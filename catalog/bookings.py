@@ -0,0 +1,89 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from catalog.models import BookingSummary, Reservation, Ticket
+
+
+def _merge_upcoming(upcoming, performances):
+    """Add {(performance id, show time): tickets} to an upcoming list"""
+    merged = Counter(
+        {
+            (performance_id, show_time): tickets
+            for performance_id, show_time, tickets in upcoming
+        }
+    )
+    for (performance_id, show_time), tickets in performances.items():
+        merged[(performance_id, show_time.isoformat())] += tickets
+    return sorted(
+        (
+            [performance_id, show_time, tickets]
+            for (performance_id, show_time), tickets in merged.items()
+        ),
+        key=lambda entry: (parse_datetime(entry[1]), entry[0]),
+    )
+
+
+def record_reservation(reservation, tickets):
+    """Add a new reservation and its ticket objects to the user's summary"""
+    performances = Counter(
+        (ticket.performance_id, ticket.performance.show_time)
+        for ticket in tickets
+        if ticket.performance.show_time >= timezone.now()
+    )
+    with transaction.atomic():
+        summary, _ = BookingSummary.objects.select_for_update().get_or_create(
+            user_id=reservation.user_id
+        )
+        summary.total_reservations += 1
+        summary.total_tickets += len(tickets)
+        summary.upcoming = _merge_upcoming(summary.upcoming, performances)
+        summary.save()
+
+
+def rebuild_booking_summaries(user_ids):
+    """Recompute summaries from the reservations, e.g. after a reschedule"""
+    now = timezone.now()
+    existing = get_user_model().objects.filter(id__in=set(user_ids))
+    for user_id in existing.values_list("id", flat=True):
+        reservations = Reservation.objects.filter(user_id=user_id)
+        totals = reservations.aggregate(
+            total_reservations=Count("id", distinct=True),
+            live_tickets=Count("tickets", distinct=True),
+            archived_tickets=Count("archived_tickets", distinct=True),
+        )
+        performances = Counter()
+        for performance_id, show_time, tickets in (
+            Ticket.objects.filter(
+                reservation__user_id=user_id, performance__show_time__gte=now
+            )
+            .values_list("performance_id", "performance__show_time")
+            .annotate(tickets=Count("id"))
+        ):
+            performances[(performance_id, show_time)] = tickets
+        BookingSummary.objects.update_or_create(
+            user_id=user_id,
+            defaults={
+                "total_reservations": totals["total_reservations"],
+                "total_tickets": totals["live_tickets"] + totals["archived_tickets"],
+                "upcoming": _merge_upcoming([], performances),
+            },
+        )
+
+
+def get_booking_summary(user):
+    summary = BookingSummary.objects.filter(user=user).first()
+    if summary is None:
+        rebuild_booking_summaries([user.id])
+        return BookingSummary.objects.get(user=user)
+
+    now = timezone.now()
+    upcoming = [entry for entry in summary.upcoming if parse_datetime(entry[1]) >= now]
+    if len(upcoming) != len(summary.upcoming):
+        BookingSummary.objects.filter(user=user).update(upcoming=upcoming)
+        summary.upcoming = upcoming
+    return summary
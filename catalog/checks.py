@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Replica pins only hold across processes with a shared cache"""
+    if getattr(settings, "DATABASE_REPLICAS", []) and isinstance(
+        caches["default"], LocMemCache
+    ):
+        return [
+            Warning(
+                "Read replicas are configured with a per-process cache: a "
+                "request served by another process ignores the user's pin "
+                "to the primary and may miss their own bookings.",
+                hint="Set REDIS_URL (or another shared CACHES backend).",
+                id="catalog.W001",
+            )
+        ]
+    return []
@@ -0,0 +1,148 @@
+import hashlib
+import time
+from datetime import timedelta
+
+import orjson
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from catalog.models import IdempotencyKey
+from catalog.renderers import dumps
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# Response headers stored with the body and replayed to retries
+REPLAYED_HEADERS = ("Location",)
+
+
+def _request_hash(request):
+    return hashlib.sha256(
+        orjson.dumps(request.data, default=str, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+
+def _claim(user, key, request_hash):
+    """Insert the in-flight marker; return None if the key is already taken"""
+    cutoff = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+    IdempotencyKey.objects.filter(user=user, created_at__lt=cutoff).delete()
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                user=user, key=key, request_hash=request_hash
+            )
+    except IntegrityError:
+        return None
+
+
+def _reclaim(user, key):
+    """
+    Take over an in-flight marker whose request outlived its lease; None if
+    it's still leased or another retry took it first.
+    """
+    now = timezone.now()
+    expired = now - timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS)
+    taken = IdempotencyKey.objects.filter(
+        user=user, key=key, status_code__isnull=True, created_at__lt=expired
+    ).update(created_at=now)
+    if taken:
+        return IdempotencyKey.objects.get(user=user, key=key)
+    return None
+
+
+# Honour the Idempotency-Key header on create(): the first successful response
+# is stored per (user, key) and replayed to retries, which wait for a first
+# request that is still in flight instead of racing it, or take it over once
+# its lease has expired.
+class IdempotentCreateMixin:
+    idempotency_wait_seconds = 5
+    idempotency_poll_interval = 0.1
+
+    def _wait_for_response(self, user, key):
+        deadline = time.monotonic() + self.idempotency_wait_seconds
+        while True:
+            record = (
+                IdempotencyKey.objects.filter(user=user, key=key)
+                .only(
+                    "request_hash", "status_code", "response_body", "response_headers"
+                )
+                .first()
+            )
+            if record is None or record.status_code is not None:
+                return record
+            if time.monotonic() >= deadline:
+                return record
+            time.sleep(self.idempotency_poll_interval)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                IDEMPOTENCY_HEADER,
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.HEADER,
+                description="Client-generated key; retries replay the first response",
+            )
+        ]
+    )
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > 255:
+            raise ValidationError(
+                {
+                    IDEMPOTENCY_HEADER: "Ensure this header has no more than 255 characters."
+                }
+            )
+
+        request_hash = _request_hash(request)
+        record = _claim(request.user, key, request_hash)
+        if record is None:
+            return self._replay(request, key, request_hash)
+        return self._create_and_store(record, request, *args, **kwargs)
+
+    def _create_and_store(self, record, request, *args, **kwargs):
+        try:
+            response = super().create(request, *args, **kwargs)
+        except Exception:
+            # Failed requests aren't stored, so a retry gets a fresh attempt.
+            record.delete()
+            raise
+
+        record.status_code = response.status_code
+        record.response_body = dumps(response.data)
+        record.response_headers = {
+            name: response[name] for name in REPLAYED_HEADERS if name in response
+        }
+        record.save(update_fields=["status_code", "response_body", "response_headers"])
+        return response
+
+    def _replay(self, request, key, request_hash):
+        record = self._wait_for_response(request.user, key)
+        if record is None:
+            # The first request failed and released the key meanwhile.
+            return self.create(request)
+        if record.request_hash != request_hash:
+            return Response(
+                {"detail": "Idempotency-Key was already used with another payload."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if record.status_code is None:
+            record = _reclaim(request.user, key)
+            if record is None:
+                return Response(
+                    {"detail": "A request with this Idempotency-Key is in progress."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            return self._create_and_store(record, request)
+        response = Response(
+            orjson.loads(record.response_body),
+            status=record.status_code,
+            headers=record.response_headers,
+        )
+        response["Idempotent-Replayed"] = "true"
+        return response
@@ -0,0 +1,177 @@
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, Max, Q, Sum
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from catalog.models import Job
+
+# Task name -> dotted path of the callable, imported on first use so the
+# worker doesn't load every module up front
+TASKS = {
+    "archive_tickets": "catalog.jobs.archive_tickets",
+    "rebuild_booking_summaries": "catalog.bookings.rebuild_booking_summaries",
+    "refresh_sales": "catalog.analytics.refresh_sales",
+    "refresh_schedule": "catalog.schedule.refresh_schedule",
+}
+RETRY_DELAY_SECONDS = 30
+HEARTBEAT_SECONDS = 30
+
+
+def archive_tickets(**options):
+    out = StringIO()
+    call_command("archive_tickets", stdout=out, **options)
+    return out.getvalue().strip()
+
+
+def enqueue(task, delay=0, max_attempts=3, **kwargs):
+    """Queue a task to run in `delay` seconds with JSON-serializable kwargs"""
+    if task not in TASKS:
+        raise ValueError(f"Unknown job task: {task}")
+    return Job.objects.create(
+        task=task,
+        kwargs=kwargs,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts,
+    )
+
+
+def _mark_running(job_ids, now):
+    return Job.objects.filter(id__in=job_ids, status=Job.QUEUED).update(
+        status=Job.RUNNING,
+        started_at=now,
+        heartbeat_at=now,
+        attempts=F("attempts") + 1,
+    )
+
+
+def claim_jobs(limit):
+    """
+    Mark up to `limit` due jobs as running and return their ids. Workers
+    skip each other's locked rows where the database supports it; elsewhere
+    (SQLite) each job is claimed with a conditional update instead.
+    """
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.QUEUED, run_at__lte=now).order_by(
+        "run_at", "id"
+    )
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job_ids = list(
+                due.select_for_update(skip_locked=True).values_list("id", flat=True)[
+                    :limit
+                ]
+            )
+            _mark_running(job_ids, now)
+        return job_ids
+
+    claimed = []
+    for job_id in due.values_list("id", flat=True)[:limit]:
+        if _mark_running([job_id], now):
+            claimed.append(job_id)
+    return claimed
+
+
+def requeue_stale_jobs(older_than):
+    """
+    Recover jobs of workers that died: running jobs without a heartbeat for
+    `older_than` seconds are queued again, or fail once out of attempts.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=older_than)
+    stale = Job.objects.filter(status=Job.RUNNING).filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    )
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.FAILED,
+        error="The worker running this job stopped responding.",
+        finished_at=now,
+    )
+    return failed + stale.update(status=Job.QUEUED, run_at=now)
+
+
+@contextmanager
+def _heartbeat(job_id, interval=HEARTBEAT_SECONDS):
+    """Refresh the job's heartbeat from a background thread while it runs"""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                Job.objects.filter(id=job_id, status=Job.RUNNING).update(
+                    heartbeat_at=timezone.now()
+                )
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(job_id):
+    """
+    Run a claimed job and record its timing; a failed job is retried with
+    exponential backoff until it runs out of attempts.
+    """
+    job = Job.objects.get(id=job_id)
+    started = time.perf_counter()
+    try:
+        with _heartbeat(job.id):
+            result = import_string(TASKS[job.task])(**job.kwargs)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.QUEUED
+            job.run_at = timezone.now() + timedelta(
+                seconds=RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+            )
+        else:
+            job.status = Job.FAILED
+    else:
+        job.status = Job.SUCCEEDED
+        job.result = result
+        job.error = ""
+    job.duration = time.perf_counter() - started
+    job.finished_at = timezone.now()
+    job.save(
+        update_fields=["status", "run_at", "result", "error", "duration", "finished_at"]
+    )
+    return job
+
+
+def run_pooled_job(job_id):
+    """run_job for pool workers, which must not keep idle connections open"""
+    try:
+        return run_job(job_id)
+    finally:
+        connection.close()
+
+
+def job_stats(since=None):
+    """Run count, failures and timings per task"""
+    jobs = Job.objects.filter(finished_at__isnull=False)
+    if since is not None:
+        jobs = jobs.filter(finished_at__gte=since)
+    return list(
+        jobs.order_by("task")
+        .values("task")
+        .annotate(
+            runs=Count("id"),
+            failed=Count("id", filter=~Q(status=Job.SUCCEEDED)),
+            avg_duration=Avg("duration"),
+            max_duration=Max("duration"),
+            total_duration=Sum("duration"),
+        )
+    )
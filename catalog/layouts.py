@@ -0,0 +1,82 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+from django.core.exceptions import ValidationError
+
+NO_SEAT = "."
+DEFAULT_ZONE = "A"
+LAYOUT_ROW = re.compile(r"[A-Za-z0-9.]+")
+
+
+class SeatLayout:
+    """
+    Seats of a hall parsed from its layout rows: a bit mask per row (bit n
+    set when seat n + 1 exists) and the zone id character of every seat.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.masks = tuple(
+            sum(1 << index for index, zone in enumerate(row) if zone != NO_SEAT)
+            for row in rows
+        )
+        self.capacity = sum(mask.bit_count() for mask in self.masks)
+
+    def has_seat(self, row, seat):
+        return (
+            1 <= row <= len(self.masks)
+            and seat >= 1
+            and bool(self.masks[row - 1] >> (seat - 1) & 1)
+        )
+
+    def zone(self, row, seat):
+        return self.rows[row - 1][seat - 1]
+
+    @property
+    def zone_capacity(self):
+        return Counter(zone for row in self.rows for zone in row if zone != NO_SEAT)
+
+    def available_by_zone(self, taken):
+        """Free seats per zone, given the (row, seat) pairs already taken"""
+        available = self.zone_capacity
+        available.subtract(
+            self.zone(row, seat) for row, seat in taken if self.has_seat(row, seat)
+        )
+        return dict(sorted(available.items()))
+
+
+@lru_cache(maxsize=1024)
+def _parse(rows):
+    return SeatLayout(rows)
+
+
+def get_layout(hall):
+    """Parsed layout of a hall, a plain rectangle when it has none (cached)"""
+    if hall.layout:
+        return _parse(tuple(hall.layout))
+    return _parse((DEFAULT_ZONE * hall.seats_in_row,) * hall.rows)
+
+
+def validate_layout(value):
+    if value is None:
+        return
+    if not isinstance(value, list) or not all(
+        isinstance(row, str) and LAYOUT_ROW.fullmatch(row) for row in value
+    ):
+        raise ValidationError(
+            "Layout must be a list of rows made of zone ids (letters or "
+            f"digits) and '{NO_SEAT}' where there is no seat."
+        )
+
+
+def validate_layout_fits(layout, rows, seats_in_row):
+    if layout and (
+        len(layout) != rows or max(len(row) for row in layout) > seats_in_row
+    ):
+        raise ValidationError(
+            {
+                "layout": f"Layout must have {rows} rows "
+                f"of at most {seats_in_row} seats."
+            }
+        )
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from catalog.models import ArchivedTicket, Ticket
+
+
+class Command(BaseCommand):
+    """
+    Command to move tickets of performances older than --days into the
+    archive table, in batches that each commit on their own so an
+    interrupted run simply resumes where it stopped.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days must not be negative")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        expired = Ticket.objects.filter(performance__show_time__lt=cutoff).order_by(
+            "id"
+        )
+        using = router.db_for_write(Ticket)
+        connection = connections[using]
+        table = connection.ops.quote_name(Ticket._meta.db_table)
+        archived = 0
+
+        while True:
+            with transaction.atomic(using=using):
+                batch = list(
+                    expired.using(using).values_list(
+                        "id", "row", "seat", "performance_id", "reservation_id"
+                    )[: options["batch_size"]]
+                )
+                if not batch:
+                    break
+                ArchivedTicket.objects.using(using).bulk_create(
+                    [
+                        ArchivedTicket(
+                            id=ticket_id,
+                            row=row,
+                            seat=seat,
+                            performance_id=performance_id,
+                            reservation_id=reservation_id,
+                        )
+                        for ticket_id, row, seat, performance_id, reservation_id in batch
+                    ],
+                    ignore_conflicts=True,
+                )
+                # Tickets have no dependents, and past performances need no
+                # schedule refresh or seat events: delete in plain SQL, which
+                # sends no per-row signals
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"DELETE FROM {table} WHERE id IN "
+                        f"({', '.join(['%s'] * len(batch))})",
+                        [ticket[0] for ticket in batch],
+                    )
+            archived += len(batch)
+            if options.get("verbosity", 1) > 1:
+                self.stdout.write(f"Archived {archived} tickets...")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {archived} tickets of performances before {cutoff:%Y-%m-%d}"
+            )
+        )
@@ -0,0 +1,433 @@
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Q
+
+from django.utils import timezone
+
+from catalog.booking_queue import enqueue_booking, process_booking_queue
+from catalog.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from catalog.search import (
+    invalidate_actor_index,
+    refresh_search_documents,
+    search_actor_ids,
+    search_play_ids,
+)
+from catalog.serializers import (
+    ReservationSerializer,
+    PerformanceListCompiledSerializer,
+    PerformanceListSerializer,
+    PlayListCompiledSerializer,
+    PlayListSerializer,
+)
+from catalog.views import PerformanceViewSet
+
+WORDS = (
+    "love war king queen ghost storm night summer dream winter tale ballet "
+    "opera comedy tragedy prince sister garden river shadow mirror city"
+).split()
+
+
+def _percentiles(timings):
+    timings = sorted(timings)
+    return {
+        "p50_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[max(int(len(timings) * 0.95) - 1, 0)] * 1000,
+        "mean_ms": statistics.fmean(timings) * 1000,
+    }
+
+
+def _timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return _percentiles(timings)
+
+
+@contextmanager
+def _rolled_back():
+    """Seed benchmark data that never outlives the benchmark"""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def _sentence(length):
+    return " ".join(random.choices(WORDS, k=length))
+
+
+def bench_db_connections(command, options):
+    """
+    Performance list latency with per-request vs reused connections, and
+    with prepared statements on vs off where psycopg 3 prepares them.
+    """
+    settings_dict = connections["default"].settings_dict
+    configured = {key: settings_dict[key] for key in ("CONN_MAX_AGE", "OPTIONS")}
+    runs = {
+        "per request (CONN_MAX_AGE=0)": {"CONN_MAX_AGE": 0},
+        f"configured (CONN_MAX_AGE={configured['CONN_MAX_AGE']})": {},
+    }
+    if configured["OPTIONS"].get("prepare_threshold") is not None:
+        runs["configured, prepared statements off"] = {
+            "OPTIONS": {**configured["OPTIONS"], "prepare_threshold": None}
+        }
+
+    def request():
+        started = time.perf_counter()
+        list(PerformanceViewSet.queryset[:20])
+        close_old_connections()
+        return time.perf_counter() - started
+
+    results = {}
+    for label, overrides in runs.items():
+        settings_dict.update(configured, **overrides)
+        # Fresh pool threads, so every run opens connections with its settings
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            timings = list(pool.map(lambda _: request(), range(options["requests"])))
+        results[label] = _percentiles(timings)
+    settings_dict.update(configured)
+    return results
+
+
+def bench_play_search(command, options):
+    """Full-text search against the icontains filters it replaces"""
+    with _rolled_back():
+        plays = Play.objects.bulk_create(
+            Play(
+                title=_sentence(2),
+                description=_sentence(40) + (" zanzibar" if index % 1000 == 0 else ""),
+            )
+            for index in range(options["size"])
+        )
+        refresh_search_documents([play.id for play in plays])
+
+        # Rare word: the LIKE scans can't stop early after 50 hits
+        term = "zanzib"
+        return {
+            "title icontains": _timed(
+                lambda: list(Play.objects.filter(title__icontains=term)[:50]),
+                options["requests"],
+            ),
+            "title/description icontains": _timed(
+                lambda: list(
+                    Play.objects.filter(
+                        Q(title__icontains=term) | Q(description__icontains=term)
+                    )[:50]
+                ),
+                options["requests"],
+            ),
+            "full-text search": _timed(
+                lambda: search_play_ids(term), options["requests"]
+            ),
+        }
+
+
+def bench_actor_lookup(command, options):
+    """Actor typeahead on seeded actors, index build excluded"""
+    first_names = [word.capitalize() + suffix for word in WORDS for suffix in "aeio"]
+    with _rolled_back():
+        Actor.objects.bulk_create(
+            Actor(
+                first_name=random.choice(first_names),
+                last_name=_sentence(1).capitalize() + str(index),
+            )
+            for index in range(options["size"])
+        )
+        invalidate_actor_index()
+        search_actor_ids("warm up")
+        results = {
+            label: _timed(lambda: search_actor_ids(query), options["requests"])
+            for label, query in (
+                ("prefix", "ghos"),
+                ("full name", "Stormi Tale42"),
+                ("typo", "Wintr"),
+            )
+        }
+        invalidate_actor_index()
+        return results
+
+
+def bench_list_serializers(command, options):
+    """Rows per second of list serializers vs their compiled versions"""
+    results = {}
+    with _rolled_back():
+        hall = TheatreHall.objects.create(name="Bench", rows=20, seats_in_row=30)
+        genres = Genre.objects.bulk_create(Genre(name=word) for word in WORDS[:5])
+        actors = Actor.objects.bulk_create(
+            Actor(first_name=word, last_name=word) for word in WORDS
+        )
+        plays = Play.objects.bulk_create(
+            Play(title=_sentence(2), description="", image=f"plays/{index}.jpg")
+            for index in range(1000)
+        )
+        for play in plays:
+            play.genres.set(random.sample(genres, 2))
+            play.actors.set(random.sample(actors, 4))
+        Performance.objects.bulk_create(
+            Performance(
+                play=play,
+                theatre_hall=hall,
+                show_time=timezone.now(),
+                play_title=play.title,
+                theatre_hall_name=hall.name,
+            )
+            for play in plays
+        )
+
+        for page_size in (100, 1000):
+            for label, serializer_class, queryset in (
+                ("performance", PerformanceListSerializer, PerformanceViewSet.queryset),
+                (
+                    "performance compiled",
+                    PerformanceListCompiledSerializer,
+                    PerformanceViewSet.queryset,
+                ),
+                (
+                    "play",
+                    PlayListSerializer,
+                    Play.objects.prefetch_related("genres", "actors"),
+                ),
+                ("play compiled", PlayListCompiledSerializer, Play.objects.all()),
+            ):
+                stats = _timed(
+                    lambda: serializer_class(queryset[:page_size], many=True).data,
+                    options["requests"],
+                )
+                stats["rows_per_s"] = page_size / stats["mean_ms"] * 1000
+                results[f"{label} x{page_size}"] = stats
+    return results
+
+
+def bench_booking_intake(command, options):
+    """
+    Reservations per second booked directly vs through the booking queue
+    (validation included in both). Runs in one rolled-back transaction, so
+    it measures the per-booking work, not lock contention between clients.
+    """
+    bookings = options["requests"]
+    with _rolled_back():
+        user = get_user_model().objects.create_user(
+            email="benchmark@example.com", password="benchmark"
+        )
+        hall = TheatreHall.objects.create(name="Bench", rows=bookings, seats_in_row=2)
+        play = Play.objects.create(title="Bench", description="")
+
+        def payloads(performance):
+            return [
+                {
+                    "tickets": [
+                        {"row": row, "seat": seat, "performance": performance.id}
+                        for seat in (1, 2)
+                    ]
+                }
+                for row in range(1, bookings + 1)
+            ]
+
+        def direct():
+            performance = Performance.objects.create(
+                play=play, theatre_hall=hall, show_time=timezone.now()
+            )
+            for payload in payloads(performance):
+                serializer = ReservationSerializer(data=payload)
+                serializer.is_valid(raise_exception=True)
+                serializer.save(user=user)
+
+        def queued():
+            performance = Performance.objects.create(
+                play=play,
+                theatre_hall=hall,
+                show_time=timezone.now(),
+                queued_booking=True,
+            )
+            for payload in payloads(performance):
+                serializer = ReservationSerializer(data=payload)
+                serializer.is_valid(raise_exception=True)
+                enqueue_booking(user, performance, serializer.validated_data["tickets"])
+            process_booking_queue(performance.id)
+
+        results = {}
+        for label, run in (("direct", direct), ("queued", queued)):
+            stats = _timed(run, 1)
+            results[label] = {
+                "total_ms": stats["mean_ms"],
+                "bookings_per_s": bookings / stats["mean_ms"] * 1000,
+            }
+        return results
+
+
+def bench_ticket_inserts(command, options):
+    """
+    --size tickets (ex. --size 1000) saved with full_clean vs pre-validated,
+    next to the cost of validating them through ReservationSerializer.
+    """
+    tickets = options["size"]
+    with _rolled_back():
+        user = get_user_model().objects.create_user(
+            email="benchmark@example.com", password="benchmark"
+        )
+        hall = TheatreHall.objects.create(
+            name="Bench", rows=tickets // 10 + 1, seats_in_row=10
+        )
+        play = Play.objects.create(title="Bench", description="")
+        reservation = Reservation.objects.create(user=user)
+
+        def seats():
+            return [divmod(index, 10) for index in range(tickets)]
+
+        def insert(validated):
+            performance = Performance.objects.create(
+                play=play, theatre_hall=hall, show_time=timezone.now()
+            )
+            for row, seat in seats():
+                Ticket(
+                    row=row + 1,
+                    seat=seat + 1,
+                    performance=performance,
+                    reservation=reservation,
+                ).save(validated=validated)
+
+        def serializer_validation():
+            performance = Performance.objects.create(
+                play=play, theatre_hall=hall, show_time=timezone.now()
+            )
+            serializer = ReservationSerializer(
+                data={
+                    "tickets": [
+                        {
+                            "row": row + 1,
+                            "seat": seat + 1,
+                            "performance": performance.id,
+                        }
+                        for row, seat in seats()
+                    ]
+                }
+            )
+            serializer.is_valid(raise_exception=True)
+
+        results = {}
+        for label, run in (
+            ("save with full_clean", lambda: insert(False)),
+            ("save(validated=True)", lambda: insert(True)),
+            ("serializer validation", serializer_validation),
+        ):
+            stats = _timed(run, 1)
+            results[label] = {
+                "total_ms": stats["mean_ms"],
+                "tickets_per_s": tickets / stats["mean_ms"] * 1000,
+            }
+        return results
+
+
+BOOT_SCRIPT = """
+import resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(time.perf_counter() - started, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, len(sys.modules))
+"""
+
+
+def _boot(env, importtime=False):
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run(
+        [sys.executable, *flags, "-c", BOOT_SCRIPT],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_profile(stderr, top=8):
+    """Self import time per top-level package from -X importtime output"""
+    packages = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line.split(":", 1)[1].split("|")
+        packages[module.strip().split(".")[0]] += int(self_us)
+    return {f"{name}_ms": us / 1000 for name, us in packages.most_common(top)}
+
+
+def bench_cold_start(command, options):
+    """
+    Process boot (django.setup and URLconf) of --requests fresh
+    interpreters (ex. --requests 20), default vs API_ONLY=1 settings,
+    with the packages that cost the most import time.
+    """
+    results = {}
+    for label, api_only in (("default", ""), ("API_ONLY=1", "1")):
+        env = {**os.environ, "API_ONLY": api_only}
+        timings, rss, modules = [], [], []
+        for _ in range(options["requests"]):
+            seconds, maxrss_kb, loaded = _boot(env).stdout.split()
+            timings.append(float(seconds))
+            rss.append(int(maxrss_kb) / 1024)
+            modules.append(int(loaded))
+        results[label] = {
+            **_percentiles(timings),
+            "rss_mb": statistics.median(rss),
+            "modules": statistics.median(modules),
+        }
+        results[f"{label} imports"] = _import_profile(
+            _boot(env, importtime=True).stderr
+        )
+    return results
+
+
+SCENARIOS = {
+    "booking_intake": bench_booking_intake,
+    "cold_start": bench_cold_start,
+    "actor_lookup": bench_actor_lookup,
+    "db_connections": bench_db_connections,
+    "list_serializers": bench_list_serializers,
+    "play_search": bench_play_search,
+    "ticket_inserts": bench_ticket_inserts,
+}
+
+
+class Command(BaseCommand):
+    """Command to measure hot code paths against the configured database"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenario", choices=sorted(SCENARIOS))
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--size", type=int, default=10000, help="Rows to seed, if any"
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be positive")
+
+        results = SCENARIOS[options["scenario"]](self, options)
+        for label, stats in results.items():
+            formatted = ", ".join(
+                f"{name}={value:.2f}" for name, value in stats.items()
+            )
+            self.stdout.write(f"{label}: {formatted}")
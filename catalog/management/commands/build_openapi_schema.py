@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from theatre_api_service.schema import write_schema
+
+
+class Command(BaseCommand):
+    """
+    Command to prebuild the OpenAPI schema files (plain and gzipped) that
+    /api/schema/ serves; run it on every deploy.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default=settings.OPENAPI_SCHEMA_DIR)
+
+    def handle(self, *args, **options):
+        for path in write_schema(options["dir"]):
+            self.stdout.write(self.style.SUCCESS(f"Schema written to {path}"))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.analytics import SALES_RESCAN_WINDOW, refresh_sales
+
+
+class Command(BaseCommand):
+    """
+    Command to update the daily sales rollup with the tickets sold since
+    the last run; --full rebuilds every performance (backfill).
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--rescan", type=int, default=SALES_RESCAN_WINDOW)
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        if options["rescan"] < 0:
+            raise CommandError("--rescan must not be negative")
+
+        refreshed = refresh_sales(
+            full=options["full"],
+            batch_size=options["batch_size"],
+            rescan=options["rescan"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Sales rollup refreshed for {refreshed} performances")
+        )
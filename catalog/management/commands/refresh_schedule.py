@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from catalog.models import ScheduleEntry
+from catalog.schedule import refresh_schedule
+
+
+class Command(BaseCommand):
+    """Command to rebuild the "what's on" schedule table"""
+
+    def handle(self, *args, **options):
+        expired, _ = ScheduleEntry.objects.filter(show_time__lt=timezone.now()).delete()
+        refreshed = refresh_schedule()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Schedule refreshed: {refreshed} upcoming, {expired} expired removed"
+            )
+        )
@@ -0,0 +1,77 @@
+import time
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from catalog.booking_queue import (
+    acquire_worker_lock,
+    extend_worker_lock,
+    process_booking_queue,
+    release_worker_lock,
+)
+from catalog.models import BookingRequest
+
+
+class Command(BaseCommand):
+    """
+    Command to work the booking queue: one worker per performance assigns
+    seats to pending requests. Runs until stopped unless --once is given.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--performance",
+            type=int,
+            action="append",
+            help="Performance id to work on (repeatable, default: all pending)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--interval", type=float, default=0.5)
+        parser.add_argument("--lock-timeout", type=int, default=60)
+        parser.add_argument("--once", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        while True:
+            processed = self.work(options)
+            if options["once"]:
+                break
+            if not processed:
+                time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS("Booking queue drained"))
+
+    def work(self, options):
+        performance_ids = options["performance"] or set(
+            BookingRequest.objects.filter(status=BookingRequest.PENDING)
+            .order_by()
+            .values_list("performance_id", flat=True)
+            .distinct()
+        )
+        processed = 0
+        for performance_id in performance_ids:
+            if not acquire_worker_lock(performance_id, options["lock_timeout"]):
+                continue
+            try:
+                processed += process_booking_queue(
+                    performance_id,
+                    batch_size=options["batch_size"],
+                    heartbeat=partial(
+                        extend_worker_lock, performance_id, options["lock_timeout"]
+                    ),
+                )
+            except IntegrityError as error:
+                # Seats keep being booked outside the queue: the batch is
+                # still pending, leave it to the next pass.
+                self.stderr.write(
+                    f"Booking queue of performance {performance_id} retried later: "
+                    f"{error}"
+                )
+            finally:
+                release_worker_lock(performance_id)
+        if processed and options.get("verbosity", 1) > 1:
+            self.stdout.write(f"Processed {processed} booking requests")
+        return processed
@@ -0,0 +1,127 @@
+import multiprocessing
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.jobs import (
+    HEARTBEAT_SECONDS,
+    claim_jobs,
+    job_stats,
+    requeue_stale_jobs,
+    run_job,
+    run_pooled_job,
+)
+from catalog.models import Job
+
+
+class Command(BaseCommand):
+    """
+    Command to run queued maintenance jobs (see catalog.jobs). Jobs run
+    inline, or on a thread or process pool of --concurrency workers.
+    Runs until stopped unless --once is given, which drains the due jobs.
+    """
+
+    # Workers serve no URLs: skip the checks that would import all views
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--pool", choices=["thread", "process"], default="thread")
+        parser.add_argument("--interval", type=float, default=1.0)
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=300,
+            help="Requeue running jobs without a heartbeat for this many seconds",
+        )
+        parser.add_argument("--once", action="store_true")
+        parser.add_argument("--stats", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be positive")
+        if options["stale_after"] <= HEARTBEAT_SECONDS:
+            # Running jobs would be requeued between two of their heartbeats
+            raise CommandError(
+                f"--stale-after must be more than the {HEARTBEAT_SECONDS}s "
+                "heartbeat interval"
+            )
+        if options["stats"]:
+            return self.print_stats()
+
+        executor = self.get_executor(options)
+        if executor is None:
+            self.run_inline(options)
+        else:
+            try:
+                self.run_pooled(executor, options)
+            finally:
+                executor.shutdown()
+
+        self.stdout.write(self.style.SUCCESS("Job queue drained"))
+
+    def run_inline(self, options):
+        while True:
+            requeue_stale_jobs(options["stale_after"])
+            job_ids = claim_jobs(1)
+            for job_id in job_ids:
+                self.report(run_job(job_id), options)
+            if not job_ids:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+
+    def run_pooled(self, executor, options):
+        """Claim a new job as soon as a pool worker is free"""
+        running = set()
+        while True:
+            requeue_stale_jobs(options["stale_after"])
+            if len(running) < options["concurrency"]:
+                running.update(
+                    executor.submit(run_pooled_job, job_id)
+                    for job_id in claim_jobs(options["concurrency"] - len(running))
+                )
+            if not running:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+            done, running = wait(
+                running, timeout=options["interval"], return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                self.report(future.result(), options)
+
+    def get_executor(self, options):
+        if options["concurrency"] == 1:
+            return None
+        if options["pool"] == "thread":
+            return ThreadPoolExecutor(options["concurrency"])
+        # Spawned, not forked: children must not share the parent's
+        # database connections
+        return ProcessPoolExecutor(
+            options["concurrency"],
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        )
+
+    def report(self, job, options):
+        if job.status == Job.SUCCEEDED:
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{job} in {job.duration:.3f}s")
+        else:
+            self.stderr.write(f"{job} in {job.duration:.3f}s, attempt {job.attempts}")
+
+    def print_stats(self):
+        for row in job_stats():
+            self.stdout.write(
+                f"{row['task']}: {row['runs']} runs, {row['failed']} failed, "
+                f"avg {row['avg_duration']:.3f}s, max {row['max_duration']:.3f}s"
+            )
@@ -1,31 +1,48 @@
-import time
-from django.db import connections
-from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+
+from theatre_api_service.health import database_ready, pending_migrations, wait_until
 
 
 class Command(BaseCommand):
-    """Command to pause execution until database is available"""
+    """
+    Command to pause execution until database is available, retrying with
+    exponential backoff from 50ms; --migrated also waits until no
+    migrations are pending (for processes started next to `migrate`).
+    """
+
+    # The checks would import every URLconf and view before the probe
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--timeout", type=float, default=30.0)
+        parser.add_argument("--max-delay", type=float, default=2.0)
+        parser.add_argument("--migrated", action="store_true")
 
     def handle(self, *args, **options):
         self.stdout.write("Waiting for database...")
-        db_conn = None
-        attempt = 0
-        max_attempts = 30
-        verbosity = options.get("verbosity", 1)
-
-        while db_conn is None and attempt < max_attempts:
-            try:
-                db_conn = connections["default"].cursor()
-            except OperationalError:
-                if verbosity > 0:
-                    self.stdout.write("Database unavailable, waiting 1 second...")
-                time.sleep(1)
-                attempt += 1
-
-        if db_conn:
-            self.stdout.write(self.style.SUCCESS("Database available!"))
-        else:
-            self.stdout.write(
-                self.style.ERROR("Failed to connect to database after several attempts")
+        if not self.wait(database_ready, "Database unavailable", options):
+            raise CommandError(
+                f"Failed to connect to database within {options['timeout']}s"
             )
+        self.stdout.write(self.style.SUCCESS("Database available!"))
+
+        if options["migrated"]:
+            if not self.wait(
+                lambda: not pending_migrations(), "Migrations pending", options
+            ):
+                raise CommandError(
+                    f"Migrations still pending after {options['timeout']}s"
+                )
+            self.stdout.write(self.style.SUCCESS("Migrations applied!"))
+
+    def wait(self, check, message, options):
+        def on_retry(attempt, delay):
+            if options["verbosity"] > 0:
+                self.stdout.write(f"{message}, retrying in {delay:.2f}s...")
+
+        return wait_until(
+            check,
+            timeout=options["timeout"],
+            max_delay=options["max_delay"],
+            on_retry=on_retry,
+        )
@@ -0,0 +1,75 @@
+# Generated by Django 5.0.14 on 2026-10-19 17:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.utils import timezone
+
+
+def build_schedule(apps, schema_editor):
+    Performance = apps.get_model("catalog", "Performance")
+    ScheduleEntry = apps.get_model("catalog", "ScheduleEntry")
+    performances = (
+        Performance.objects.filter(show_time__gte=timezone.now())
+        .select_related("play", "theatre_hall")
+        .prefetch_related("play__genres")
+        .annotate(
+            tickets_available=(
+                F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
+                - Count("tickets")
+            )
+        )
+    )
+    ScheduleEntry.objects.bulk_create(
+        ScheduleEntry(
+            performance=performance,
+            show_time=performance.show_time,
+            play_id=performance.play_id,
+            play_title=performance.play.title,
+            play_image=performance.play.image.name or "",
+            genres=[genre.name for genre in performance.play.genres.all()],
+            theatre_hall_name=performance.theatre_hall.name,
+            theatre_hall_capacity=(
+                performance.theatre_hall.rows * performance.theatre_hall.seats_in_row
+            ),
+            tickets_available=performance.tickets_available,
+        )
+        for performance in performances
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0003_alter_ticket_options_alter_ticket_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduleEntry",
+            fields=[
+                (
+                    "performance",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="schedule_entry",
+                        serialize=False,
+                        to="catalog.performance",
+                    ),
+                ),
+                ("show_time", models.DateTimeField(db_index=True)),
+                ("play_id", models.BigIntegerField()),
+                ("play_title", models.CharField(max_length=70)),
+                ("play_image", models.CharField(blank=True, max_length=255)),
+                ("genres", models.JSONField(default=list)),
+                ("theatre_hall_name", models.CharField(max_length=70)),
+                ("theatre_hall_capacity", models.IntegerField()),
+                ("tickets_available", models.IntegerField()),
+            ],
+            options={
+                "ordering": ["show_time"],
+            },
+        ),
+        migrations.RunPython(build_schedule, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.0.14 on 2026-10-19 17:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+SQLITE_FTS_CREATE = [
+    "CREATE VIRTUAL TABLE catalog_playsearchdocument_fts USING fts5("
+    "title, description, keywords, "
+    "content='catalog_playsearchdocument', content_rowid='play_id')",
+    "CREATE TRIGGER catalog_playsearchdocument_fts_ai AFTER INSERT ON catalog_playsearchdocument "
+    "BEGIN INSERT INTO catalog_playsearchdocument_fts(rowid, title, description, keywords) "
+    "VALUES (new.play_id, new.title, new.description, new.keywords); END",
+    "CREATE TRIGGER catalog_playsearchdocument_fts_ad AFTER DELETE ON catalog_playsearchdocument "
+    "BEGIN INSERT INTO catalog_playsearchdocument_fts(catalog_playsearchdocument_fts, rowid, title, description, "
+    "keywords) VALUES ('delete', old.play_id, old.title, old.description, "
+    "old.keywords); END",
+    "CREATE TRIGGER catalog_playsearchdocument_fts_au AFTER UPDATE ON catalog_playsearchdocument "
+    "BEGIN INSERT INTO catalog_playsearchdocument_fts(catalog_playsearchdocument_fts, rowid, title, description, "
+    "keywords) VALUES ('delete', old.play_id, old.title, old.description, "
+    "old.keywords); INSERT INTO catalog_playsearchdocument_fts(rowid, title, description, "
+    "keywords) VALUES (new.play_id, new.title, new.description, "
+    "new.keywords); END",
+]
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS catalog_playsearchdocument_fts_ai",
+    "DROP TRIGGER IF EXISTS catalog_playsearchdocument_fts_ad",
+    "DROP TRIGGER IF EXISTS catalog_playsearchdocument_fts_au",
+    "DROP TABLE IF EXISTS catalog_playsearchdocument_fts",
+]
+
+PG_INDEX_CREATE = [
+    "CREATE INDEX catalog_playsearchdocument_gin "
+    "ON catalog_playsearchdocument USING GIN ((setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', keywords), 'B') || "
+    "setweight(to_tsvector('english', description), 'C')))"
+]
+
+PG_INDEX_DROP = ["DROP INDEX IF EXISTS catalog_playsearchdocument_gin"]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"postgresql": PG_INDEX_CREATE, "sqlite": SQLITE_FTS_CREATE}
+    for statement in statements.get(vendor, []):
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"postgresql": PG_INDEX_DROP, "sqlite": SQLITE_FTS_DROP}
+    for statement in statements.get(vendor, []):
+        schema_editor.execute(statement)
+
+
+def build_search_documents(apps, schema_editor):
+    Play = apps.get_model("catalog", "Play")
+    PlaySearchDocument = apps.get_model("catalog", "PlaySearchDocument")
+    PlaySearchDocument.objects.bulk_create(
+        PlaySearchDocument(
+            play=play,
+            title=play.title,
+            description=play.description,
+            keywords=" ".join(
+                [f"{actor.first_name} {actor.last_name}" for actor in play.actors.all()]
+                + [genre.name for genre in play.genres.all()]
+            ),
+        )
+        for play in Play.objects.prefetch_related("actors", "genres")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0004_schedule_entry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlaySearchDocument",
+            fields=[
+                (
+                    "play",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="catalog.play",
+                    ),
+                ),
+                ("title", models.CharField(max_length=70)),
+                ("description", models.TextField()),
+                ("keywords", models.TextField()),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(build_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.14 on 2026-10-19 17:32
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX catalog_actor_search_name_trgm "
+            "ON catalog_actor USING GIN (search_name gin_trgm_ops)"
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS catalog_actor_search_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0005_play_search_document"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="actor",
+            name="search_name",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Lower(
+                    models.Func(
+                        "first_name",
+                        models.Value(" "),
+                        "last_name",
+                        arg_joiner=" || ",
+                        template="(%(expressions)s)",
+                    )
+                ),
+                output_field=models.CharField(max_length=141),
+            ),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:08
+
+import catalog.layouts
+from django.db import migrations, models
+from django.db.models import F
+
+
+def count_seats(apps, schema_editor):
+    TheatreHall = apps.get_model("catalog", "TheatreHall")
+    TheatreHall.objects.update(seat_count=F("rows") * F("seats_in_row"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0011_booking_queue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="theatrehall",
+            name="layout",
+            field=models.JSONField(
+                blank=True,
+                help_text="One string per row: a zone id per seat and '.' for aisles or missing seats. Empty means every seat of the rectangle exists.",
+                null=True,
+                validators=[catalog.layouts.validate_layout],
+            ),
+        ),
+        migrations.AddField(
+            model_name="theatrehall",
+            name="seat_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_seats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0012_hall_layout"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PriceTier",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("zone", models.CharField(default="A", max_length=1)),
+                ("price", models.DecimalField(decimal_places=2, max_digits=8)),
+                (
+                    "performance",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_tiers",
+                        to="catalog.performance",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["zone"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pricetier",
+            constraint=models.UniqueConstraint(
+                fields=("performance", "zone"), name="unique_price_tier"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0014_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="idempotencykey",
+            name="response_headers",
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0015_idempotency_response_headers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="price_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
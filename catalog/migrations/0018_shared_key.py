@@ -0,0 +1,32 @@
+# Generated by Django 5.0.14 on 2026-10-19 19:11
+
+from django.db import migrations, models
+
+
+def move_actor_index_version(apps, schema_editor):
+    RollupWatermark = apps.get_model("catalog", "RollupWatermark")
+    SharedKey = apps.get_model("catalog", "SharedKey")
+    for watermark in RollupWatermark.objects.filter(name="actor_index_version"):
+        SharedKey.objects.create(name=watermark.name, value=watermark.value)
+        watermark.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0017_job_heartbeat"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SharedKey",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(move_actor_index_version, migrations.RunPython.noop),
+    ]
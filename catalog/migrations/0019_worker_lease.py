@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-19 19:14
+
+from django.db import migrations, models
+
+
+def drop_watermark_leases(apps, schema_editor):
+    RollupWatermark = apps.get_model("catalog", "RollupWatermark")
+    RollupWatermark.objects.filter(name__startswith="booking_queue:").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0018_shared_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkerLease",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("expires_at", models.BigIntegerField()),
+            ],
+        ),
+        migrations.RunPython(drop_watermark_leases, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.14 on 2026-10-19 19:40
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_labels(apps, schema_editor):
+    Performance = apps.get_model("catalog", "Performance")
+    Play = apps.get_model("catalog", "Play")
+    TheatreHall = apps.get_model("catalog", "TheatreHall")
+    Performance.objects.update(
+        play_title=Subquery(
+            Play.objects.filter(id=OuterRef("play_id")).values("title")
+        ),
+        theatre_hall_name=Subquery(
+            TheatreHall.objects.filter(id=OuterRef("theatre_hall_id")).values("name")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0019_worker_lease"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="play_title",
+            field=models.CharField(default="", editable=False, max_length=70),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="performance",
+            name="theatre_hall_name",
+            field=models.CharField(default="", editable=False, max_length=70),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_labels, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,58 @@
 import os
 import uuid
+from collections import defaultdict
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Func, Value
+from django.db.models.functions import Lower
+from django.utils import timezone
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
 
+from catalog.layouts import (
+    DEFAULT_ZONE,
+    get_layout,
+    validate_layout,
+    validate_layout_fits,
+)
+
+NO_SEAT_ERROR = "There is no such seat in the hall layout."
+
+
+def _related_label(instance, field_name, attribute=None):
+    """
+    Label of a related object for __str__: the object itself when it is
+    already loaded (select_related or accessed before), else only its id,
+    so printing a list of rows never triggers a query per row.
+    """
+    field = instance._meta.get_field(field_name)
+    if not field.is_cached(instance):
+        return f"#{getattr(instance, field.attname)}"
+    related = getattr(instance, field_name)
+    return getattr(related, attribute) if attribute else str(related)
+
 
 class Actor(models.Model):
     first_name = models.CharField(max_length=70)
     last_name = models.CharField(max_length=70)
+    # Lowercased "first last", queryable unlike the full_name property;
+    # trigram-indexed on PostgreSQL for the typeahead lookup. Joined with
+    # || since PostgreSQL rejects Concat()'s CONCAT(), which isn't
+    # immutable, in a generated column.
+    search_name = models.GeneratedField(
+        expression=Lower(
+            Func(
+                "first_name",
+                Value(" "),
+                "last_name",
+                template="(%(expressions)s)",
+                arg_joiner=" || ",
+            )
+        ),
+        output_field=models.CharField(max_length=141),
+        db_persist=True,
+    )
 
     def __str__(self):
         return self.first_name + " " + self.last_name
@@ -48,10 +91,34 @@ class TheatreHall(models.Model):
     name = models.CharField(max_length=70)
     rows = models.IntegerField()
     seats_in_row = models.IntegerField()
+    layout = models.JSONField(
+        null=True,
+        blank=True,
+        validators=[validate_layout],
+        help_text=(
+            "One string per row: a zone id per seat and '.' for aisles or "
+            "missing seats. Empty means every seat of the rectangle exists."
+        ),
+    )
+    # Seats in the layout, stored for availability counts in SQL
+    seat_count = models.IntegerField(default=0, editable=False)
+
+    @property
+    def seat_layout(self):
+        return get_layout(self)
 
     @property
     def capacity(self) -> int:
-        return self.rows * self.seats_in_row
+        return self.seat_layout.capacity
+
+    def clean(self):
+        validate_layout_fits(self.layout, self.rows, self.seats_in_row)
+
+    def save(self, *args, **kwargs):
+        self.seat_count = self.capacity
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "seat_count"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -64,20 +131,54 @@ class Reservation(models.Model):
     def __str__(self):
         return str(self.created_at)
 
+    @property
+    def all_tickets(self):
+        """Live and archived tickets, so history survives archival"""
+        return sorted(
+            [*self.tickets.all(), *self.archived_tickets.all()],
+            key=lambda ticket: (ticket.row, ticket.seat),
+        )
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["user", "-created_at"])]
 
 
 class Performance(models.Model):
     play = models.ForeignKey(Play, on_delete=models.CASCADE)
     theatre_hall = models.ForeignKey(TheatreHall, on_delete=models.CASCADE)
     show_time = models.DateTimeField()
+    queued_booking = models.BooleanField(
+        default=False,
+        help_text="Take reservations through the booking queue (on-sale spikes)",
+    )
+    # Changed with every price tier change; part of the price table cache key
+    price_version = models.PositiveIntegerField(default=0, editable=False)
+    # Stored for __str__, which admin pages and delete confirmations call
+    # on performances loaded without their play and hall; kept in sync by
+    # signals
+    play_title = models.CharField(max_length=70, editable=False)
+    theatre_hall_name = models.CharField(max_length=70, editable=False)
 
     class Meta:
         ordering = ["-show_time"]
+        indexes = [models.Index(fields=["show_time"])]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"play", "theatre_hall"} & {*update_fields}:
+            self.play_title = self.play.title
+            self.theatre_hall_name = self.theatre_hall.name
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    "play_title",
+                    "theatre_hall_name",
+                }
+        super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.play.title} at {self.theatre_hall.name} on {self.show_time}"
+        return f"{self.play_title} at {self.theatre_hall_name} on {self.show_time}"
 
 
 class Ticket(models.Model):
@@ -106,6 +207,50 @@ class Ticket(models.Model):
                         f"(1, {count_attrs})"
                     }
                 )
+        if not theatre_hall.seat_layout.has_seat(row, seat):
+            raise error_to_raise({"seat": NO_SEAT_ERROR})
+
+    @staticmethod
+    def validate_seats(tickets):
+        """
+        Validate many (performance, row, seat) triples in one pass: hall
+        bounds and layout, seats requested twice and seats already taken (one query
+        per performance). Returns an error dict per triple, empty if valid.
+        """
+        errors = [{} for _ in tickets]
+        in_bounds = defaultdict(list)
+        for index, (performance, row, seat) in enumerate(tickets):
+            hall = performance.theatre_hall
+            for value, name, hall_attr_name, count in (
+                (row, "row", "rows", hall.rows),
+                (seat, "seat", "seats_in_row", hall.seats_in_row),
+            ):
+                if not 1 <= value <= count:
+                    errors[index][name] = [
+                        f"{name} number must be in available range: "
+                        f"(1, {hall_attr_name}): (1, {count})"
+                    ]
+            if not errors[index] and not hall.seat_layout.has_seat(row, seat):
+                errors[index]["seat"] = [NO_SEAT_ERROR]
+            if not errors[index]:
+                in_bounds[performance.id].append(index)
+
+        for performance_id, indexes in in_bounds.items():
+            seats = [tickets[index][1:] for index in indexes]
+            taken = set(
+                Ticket.objects.filter(
+                    performance_id=performance_id,
+                    row__in={row for row, _ in seats},
+                ).values_list("row", "seat")
+            )
+            requested = set()
+            for index, seat in zip(indexes, seats):
+                if seat in taken:
+                    errors[index]["seat"] = ["This seat is already taken."]
+                elif seat in requested:
+                    errors[index]["seat"] = ["This seat is requested twice."]
+                requested.add(seat)
+        return errors
 
     def clean(self):
         Ticket.validate_ticket(
@@ -121,15 +266,310 @@ class Ticket(models.Model):
         force_update=False,
         using=None,
         update_fields=None,
+        validated=False,
     ):
-        self.full_clean()
+        """
+        Validate the seat (full_clean) before saving. Pass validated=True
+        only when the caller already checked seat ranges and uniqueness,
+        e.g. with validate_seats() for a whole reservation.
+        """
+        if not validated:
+            self.full_clean()
         return super(Ticket, self).save(
             force_insert, force_update, using, update_fields
         )
 
     def __str__(self):
-        return f"Ticket:{self.id}. Row: {self.row}. Seat: {self.seat}. Performance: {self.performance}"
+        return (
+            f"Ticket:{self.id}. Row: {self.row}. Seat: {self.seat}. "
+            f"Performance: {_related_label(self, 'performance')}"
+        )
 
     class Meta:
         unique_together = ("performance", "row", "seat")
         ordering = ["row", "seat"]
+
+
+class BookingSummary(models.Model):
+    """
+    Per-user booking rollup updated on every reservation, so "my bookings"
+    doesn't scan the user's history. `upcoming` holds
+    [performance id, show time, tickets] sorted by show time; entries that
+    slipped into the past are dropped when the summary is read.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="booking_summary",
+    )
+    total_reservations = models.IntegerField(default=0)
+    total_tickets = models.IntegerField(default=0)
+    upcoming = models.JSONField(default=list)
+
+    def __str__(self):
+        return f"{_related_label(self, 'user')}: {self.total_tickets} tickets"
+
+
+class ArchivedTicket(models.Model):
+    """
+    Ticket of a long-past performance, moved out of the live ticket table
+    by the archive_tickets command. Keeps the original ticket id.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="archived_tickets"
+    )
+    reservation = models.ForeignKey(
+        Reservation, on_delete=models.CASCADE, related_name="archived_tickets"
+    )
+
+    def __str__(self):
+        return f"Archived ticket:{self.id}. Row: {self.row}. Seat: {self.seat}"
+
+    class Meta:
+        ordering = ["row", "seat"]
+
+
+class ScheduleEntry(models.Model):
+    """Denormalized row of the "what's on" schedule, kept in sync by signals"""
+
+    performance = models.OneToOneField(
+        Performance,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="schedule_entry",
+    )
+    show_time = models.DateTimeField(db_index=True)
+    play_id = models.BigIntegerField()
+    play_title = models.CharField(max_length=70)
+    play_image = models.CharField(max_length=255, blank=True)
+    genres = models.JSONField(default=list)
+    theatre_hall_name = models.CharField(max_length=70)
+    theatre_hall_capacity = models.IntegerField()
+    tickets_available = models.IntegerField()
+
+    class Meta:
+        ordering = ["show_time"]
+
+    def __str__(self):
+        return f"{self.play_title} at {self.theatre_hall_name} on {self.show_time}"
+
+
+class PlaySearchDocument(models.Model):
+    """
+    Text of a play with its actor and genre names, indexed for full-text
+    search (tsvector + GIN on PostgreSQL, FTS5 table on SQLite).
+    """
+
+    play = models.OneToOneField(
+        Play,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    title = models.CharField(max_length=70)
+    description = models.TextField()
+    keywords = models.TextField()
+
+    def __str__(self):
+        return self.title
+
+
+class PerformanceSales(models.Model):
+    """
+    Daily sales rollup row of one performance, maintained by the
+    refresh_sales_rollups command; analytics group these by play, hall
+    and day instead of counting tickets.
+    """
+
+    performance = models.OneToOneField(
+        Performance,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="sales",
+    )
+    play = models.ForeignKey(Play, on_delete=models.CASCADE, related_name="+")
+    theatre_hall = models.ForeignKey(
+        TheatreHall, on_delete=models.CASCADE, related_name="+"
+    )
+    date = models.DateField(db_index=True)
+    tickets_sold = models.IntegerField(default=0)
+    capacity = models.IntegerField()
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name_plural = "performance sales"
+
+    def __str__(self):
+        return f"{self.performance_id} on {self.date}: {self.tickets_sold} sold"
+
+
+class RollupWatermark(models.Model):
+    """Highest source row id a rollup has already processed"""
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class WorkerLease(models.Model):
+    """
+    Lease of one worker on a named resource, e.g. a performance's booking
+    queue, until expires_at (epoch seconds)
+    """
+
+    name = models.CharField(max_length=100, primary_key=True)
+    expires_at = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.name} until {self.expires_at}"
+
+
+class SharedKey(models.Model):
+    """
+    Named value every process reads from the database instead of its own
+    cache, e.g. the version of an in-memory index.
+    """
+
+    name = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    First response to a request sent with an Idempotency-Key header, so
+    retries replay it. `status_code` stays empty while the first request
+    is still in flight; `created_at` starts its lease.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.BinaryField(null=True)
+    response_headers = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="unique_idempotency_key"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.key}"
+
+
+class BookingRequest(models.Model):
+    """
+    Reservation request of a queued-booking performance, waiting for the
+    performance's queue worker to assign its seats.
+    """
+
+    PENDING = "pending"
+    CONFIRMED = "confirmed"
+    REJECTED = "rejected"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (CONFIRMED, "Confirmed"),
+        (REJECTED, "Rejected"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="booking_requests",
+    )
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="booking_requests"
+    )
+    seats = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    reservation = models.OneToOneField(
+        Reservation,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="booking_request",
+    )
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["performance", "status", "id"])]
+
+    def __str__(self):
+        return f"Booking request:{self.id} ({self.status})"
+
+
+class PriceTier(models.Model):
+    """Ticket price of one zone of the hall layout for a performance"""
+
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="price_tiers"
+    )
+    zone = models.CharField(max_length=1, default=DEFAULT_ZONE)
+    price = models.DecimalField(max_digits=8, decimal_places=2)
+
+    class Meta:
+        ordering = ["zone"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["performance", "zone"], name="unique_price_tier"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.zone}: {self.price}"
+
+
+class Job(models.Model):
+    """Maintenance task queued for run_worker, see catalog.jobs"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    task = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed by the worker while the job runs; a stale one means it died
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_at", "id"]
+        indexes = [models.Index(fields=["status", "run_at"])]
+
+    def __str__(self):
+        return f"Job:{self.id} {self.task} ({self.status})"
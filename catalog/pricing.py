@@ -0,0 +1,73 @@
+import random
+
+from django.core.cache import cache
+
+from catalog.models import Performance, PriceTier
+
+# Keyed on the performance's price_version, so a price change reaches every
+# process at once and old tables simply expire
+PRICE_TABLE_CACHE_KEY = "pricing:table:{performance_id}:{version}"
+PRICE_TABLE_TIMEOUT = 60 * 60
+
+
+def price_tables(performances, loaded=None):
+    """
+    {performance id: {zone: price}} of the given performances, from
+    `loaded`, then the cache, then one query for whatever is still missing.
+    """
+    tables = {} if loaded is None else loaded
+    missing = {
+        performance.id: PRICE_TABLE_CACHE_KEY.format(
+            performance_id=performance.id, version=performance.price_version
+        )
+        for performance in performances
+        if performance.id not in tables
+    }
+    if not missing:
+        return tables
+
+    cached = cache.get_many(missing.values())
+    for performance_id, key in list(missing.items()):
+        if key in cached:
+            tables[performance_id] = cached[key]
+            del missing[performance_id]
+
+    if missing:
+        fetched = {performance_id: {} for performance_id in missing}
+        for performance_id, zone, price in PriceTier.objects.filter(
+            performance_id__in=missing
+        ).values_list("performance_id", "zone", "price"):
+            fetched[performance_id][zone] = price
+        cache.set_many(
+            {missing[pk]: table for pk, table in fetched.items()},
+            PRICE_TABLE_TIMEOUT,
+        )
+        tables.update(fetched)
+    return tables
+
+
+def invalidate_price_table(performance_id):
+    """
+    Move the performance to a new price version, in the same transaction
+    as the tier change. Random rather than incremented, so a version
+    cached by a rolled back transaction never comes back.
+    """
+    Performance.objects.filter(id=performance_id).update(
+        price_version=random.getrandbits(31)
+    )
+
+
+def ticket_price(ticket, tables):
+    """Price of a ticket's zone, None if its performance has no such tier"""
+    layout = ticket.performance.theatre_hall.seat_layout
+    if not layout.has_seat(ticket.row, ticket.seat):
+        return None
+    return tables[ticket.performance_id].get(layout.zone(ticket.row, ticket.seat))
+
+
+def reservation_total(tickets, tables):
+    """Sum of the ticket prices, None if any ticket has no price"""
+    prices = [ticket_price(ticket, tables) for ticket in tickets]
+    if None in prices:
+        return None
+    return sum(prices, start=0)
@@ -0,0 +1,63 @@
+from itertools import islice
+
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    # Types orjson doesn't know natively (Decimal, timedelta, lazy strings,
+    # querysets...) are converted the same way DRF's encoder does.
+    return encoders.JSONEncoder().default(obj)
+
+
+def dumps(data):
+    """orjson bytes matching JSONRenderer's compact output"""
+    return (
+        orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        .replace("\u2028".encode(), b"\\u2028")
+        .replace("\u2029".encode(), b"\\u2029")
+    )
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer built on orjson. Indented (browsable API) or
+    non-compact output still goes through the stdlib encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return dumps(data)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets views negotiate text/event-stream; the events themselves are
+    streamed by the view, this only renders error responses (as JSON).
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"" if data is None else dumps(data)
+
+
+def stream_json_list(items, chunk_size=500):
+    """Yield a JSON array chunk by chunk without building the whole string"""
+    items = iter(items)
+    separator = b"["
+    while chunk := list(islice(items, chunk_size)):
+        yield separator + b",".join(dumps(item) for item in chunk)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
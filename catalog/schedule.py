@@ -0,0 +1,80 @@
+import threading
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from catalog.models import Performance, ScheduleEntry
+
+_pending = threading.local()
+
+
+def refresh_schedule(performance_ids=None):
+    """
+    Rebuild schedule rows of the given upcoming performances
+    (all upcoming performances when no ids are passed).
+    """
+    performances = (
+        Performance.objects.filter(show_time__gte=timezone.now())
+        .select_related("play", "theatre_hall")
+        .prefetch_related("play__genres")
+        .annotate(tickets_available=F("theatre_hall__seat_count") - Count("tickets"))
+        .order_by()
+    )
+    stale = ScheduleEntry.objects.all()
+    if performance_ids is not None:
+        performances = performances.filter(id__in=performance_ids)
+        stale = stale.filter(performance_id__in=performance_ids)
+
+    entries = [
+        ScheduleEntry(
+            performance=performance,
+            show_time=performance.show_time,
+            play_id=performance.play_id,
+            play_title=performance.play.title,
+            play_image=performance.play.image.name or "",
+            genres=[genre.name for genre in performance.play.genres.all()],
+            theatre_hall_name=performance.theatre_hall.name,
+            theatre_hall_capacity=performance.theatre_hall.capacity,
+            tickets_available=performance.tickets_available,
+        )
+        for performance in performances
+    ]
+    with transaction.atomic():
+        stale.exclude(
+            performance_id__in=[entry.performance_id for entry in entries]
+        ).delete()
+        ScheduleEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=["performance"],
+            update_fields=[
+                "show_time",
+                "play_id",
+                "play_title",
+                "play_image",
+                "genres",
+                "theatre_hall_name",
+                "theatre_hall_capacity",
+                "tickets_available",
+            ],
+        )
+    return len(entries)
+
+
+def _flush_pending():
+    performance_ids = getattr(_pending, "performance_ids", set())
+    _pending.performance_ids = set()
+    if performance_ids:
+        refresh_schedule(performance_ids)
+
+
+def schedule_refresh(performance_ids):
+    """
+    Queue a refresh for after the current transaction commits, so a
+    reservation of many tickets refreshes each performance only once.
+    """
+    if not hasattr(_pending, "performance_ids"):
+        _pending.performance_ids = set()
+    _pending.performance_ids.update(performance_ids)
+    transaction.on_commit(_flush_pending)
@@ -0,0 +1,186 @@
+import heapq
+import random
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.db import connections, router
+from django.db.models import Q
+
+from catalog.models import Actor, Play, PlaySearchDocument, SharedKey
+
+FTS_TABLE = "catalog_playsearchdocument_fts"
+
+# Weighted tsvector over the document columns; queries repeat the exact
+# expression so PostgreSQL can use the GIN index built in the migration.
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', keywords), 'B') || "
+    "setweight(to_tsvector('english', description), 'C')"
+)
+
+# SharedKey holding the actor index version, in the database so that every
+# process sees a bump
+ACTOR_INDEX_VERSION = "actor_index_version"
+
+# Share of the query trigrams a name must contain to be suggested,
+# same as pg_trgm's default word_similarity_threshold.
+ACTOR_MATCH_THRESHOLD = 0.6
+
+
+def _terms(query):
+    return re.findall(r"\w+", query.lower())
+
+
+def refresh_search_documents(play_ids):
+    plays = Play.objects.filter(id__in=play_ids).prefetch_related("actors", "genres")
+    documents = [
+        PlaySearchDocument(
+            play=play,
+            title=play.title,
+            description=play.description,
+            keywords=" ".join(
+                [actor.full_name for actor in play.actors.all()]
+                + [genre.name for genre in play.genres.all()]
+            ),
+        )
+        for play in plays
+    ]
+    PlaySearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["play"],
+        update_fields=["title", "description", "keywords"],
+    )
+
+
+def _search_postgresql(connection, terms, limit):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT play_id FROM catalog_playsearchdocument "
+            f"WHERE ({PG_SEARCH_VECTOR}) @@ to_tsquery('english', %s) "
+            f"ORDER BY ts_rank(({PG_SEARCH_VECTOR}), "
+            "to_tsquery('english', %s)) DESC, play_id LIMIT %s",
+            [tsquery, tsquery, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _search_sqlite(connection, terms, limit):
+    match = " AND ".join(f'"{term}"*' for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}, 10.0, 1.0, 5.0), rowid LIMIT %s",
+            [match, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _search_fallback(terms, limit):
+    queryset = PlaySearchDocument.objects.all()
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term)
+            | Q(description__icontains=term)
+            | Q(keywords__icontains=term)
+        )
+    return list(queryset.values_list("play_id", flat=True)[:limit])
+
+
+def search_play_ids(query, limit=50):
+    """
+    Ids of plays whose title, description, actors or genres match every
+    word of the query as a prefix, best match first.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    connection = connections[router.db_for_read(PlaySearchDocument)]
+    if connection.vendor == "postgresql":
+        return _search_postgresql(connection, terms, limit)
+    if connection.vendor == "sqlite":
+        return _search_sqlite(connection, terms, limit)
+    return _search_fallback(terms, limit)
+
+
+def _trigrams(text, prefix=False):
+    """
+    pg_trgm style trigrams of every word padded with two leading blanks and
+    one trailing blank; with prefix=True the last word stays open-ended so
+    "carl" matches "carlotta".
+    """
+    words = _terms(text)
+    trigrams = set()
+    for index, word in enumerate(words):
+        padded = f"  {word}"
+        if not (prefix and index == len(words) - 1):
+            padded += " "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+class TrigramIndex:
+    """In-memory inverted index from trigrams to ids"""
+
+    def __init__(self, rows):
+        self.postings = defaultdict(list)
+        for row_id, text in rows:
+            for trigram in _trigrams(text):
+                self.postings[trigram].append(row_id)
+
+    def search(self, query, limit, threshold=ACTOR_MATCH_THRESHOLD):
+        trigrams = _trigrams(query, prefix=True)
+        hits = Counter()
+        for trigram in trigrams:
+            hits.update(self.postings.get(trigram, ()))
+        minimum = threshold * len(trigrams)
+        best = heapq.nlargest(
+            limit,
+            ((count, -row_id) for row_id, count in hits.items() if count >= minimum),
+        )
+        return [-row_id for _, row_id in best]
+
+
+_actor_index = {"version": None, "index": None}
+_actor_index_lock = threading.Lock()
+
+
+def invalidate_actor_index():
+    """Make every process rebuild its actor trigram index on next lookup"""
+    # A random version never comes back, even after a rolled back bump
+    SharedKey.objects.update_or_create(
+        name=ACTOR_INDEX_VERSION, defaults={"value": random.getrandbits(62)}
+    )
+
+
+def _get_actor_index():
+    version = (
+        SharedKey.objects.filter(name=ACTOR_INDEX_VERSION)
+        .values_list("value", flat=True)
+        .first()
+    )
+    with _actor_index_lock:
+        if _actor_index["index"] is None or _actor_index["version"] != version:
+            _actor_index["index"] = TrigramIndex(
+                Actor.objects.values_list("id", "search_name").iterator()
+            )
+            _actor_index["version"] = version
+        return _actor_index["index"]
+
+
+def search_actor_ids(query, limit=10):
+    """Ids of the actors whose names best match a typed-in name or prefix"""
+    if not _terms(query):
+        return []
+    connection = connections[router.db_for_read(Actor)]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT id FROM catalog_actor WHERE %s <%% search_name "
+                "ORDER BY word_similarity(%s, search_name) DESC, id LIMIT %s",
+                [query.lower(), query.lower(), limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+    return _get_actor_index().search(query, limit)
@@ -0,0 +1,159 @@
+import queue
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+
+from catalog.models import Ticket
+from catalog.pricing import price_tables
+
+_pending = threading.local()
+
+# Event telling a subscriber it missed deltas and must resubscribe
+RESYNC = None
+
+
+class LocalSeatEventBackend:
+    """
+    In-process pub/sub: every subscriber of a performance gets its own
+    queue. Only reaches clients served by the same process; set
+    SEAT_EVENTS_BACKEND to a class with the same publish()/subscribe()
+    interface (Redis, PostgreSQL LISTEN/NOTIFY...) to fan out across
+    processes.
+    """
+
+    max_queue_size = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, performance_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(performance_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # Drop the backlog of a stalled client and tell its stream
+                # to end, the client reconnects to a fresh snapshot.
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(RESYNC)
+
+    @contextmanager
+    def subscribe(self, performance_id):
+        subscriber = queue.Queue(self.max_queue_size)
+        with self._lock:
+            self._subscribers[performance_id].add(subscriber)
+        try:
+            yield subscriber
+        finally:
+            with self._lock:
+                self._subscribers[performance_id].discard(subscriber)
+                if not self._subscribers[performance_id]:
+                    del self._subscribers[performance_id]
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    return import_string(settings.SEAT_EVENTS_BACKEND)()
+
+
+def _seat_delta(performance_id, seats):
+    """Split changed seats into taken/released by their committed state"""
+    taken = set(
+        Ticket.objects.filter(
+            performance_id=performance_id, row__in={row for row, _ in seats}
+        ).values_list("row", "seat")
+    )
+    return {
+        "taken": sorted(seat for seat in seats if seat in taken),
+        "released": sorted(seat for seat in seats if seat not in taken),
+    }
+
+
+def _flush_pending():
+    changes = getattr(_pending, "changes", {})
+    _pending.changes = {}
+    backend = get_backend()
+    for performance_id, seats in changes.items():
+        backend.publish(performance_id, _seat_delta(performance_id, seats))
+
+
+def publish_seat_change(performance_id, seats):
+    """
+    Queue an event for seats that were booked or released, sent after the
+    current transaction commits: one event per performance and transaction,
+    with the seats' committed state.
+    """
+    if not hasattr(_pending, "changes"):
+        _pending.changes = {}
+    _pending.changes.setdefault(performance_id, set()).update(
+        (row, seat) for row, seat in seats
+    )
+    transaction.on_commit(_flush_pending)
+
+
+def seat_map(performance):
+    """
+    Hall layout of a performance with its taken seats, free seats and
+    ticket price per zone.
+    """
+    hall = performance.theatre_hall
+    layout = hall.seat_layout
+    taken = sorted(
+        Ticket.objects.filter(performance=performance)
+        .order_by()
+        .values_list("row", "seat")
+    )
+    return {
+        "rows": hall.rows,
+        "seats_in_row": hall.seats_in_row,
+        "layout": list(layout.rows),
+        "taken": taken,
+        "available": layout.available_by_zone(taken),
+        "prices": {
+            zone: str(price)
+            for zone, price in price_tables([performance])[performance.id].items()
+        },
+    }
+
+
+def _event(name, data):
+    # Imported here: DRF's renderers would otherwise load with the signal
+    # handlers in every process, management commands included
+    from catalog.renderers import dumps
+
+    return b"event: " + name.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def stream_seat_events(performance, max_seconds=300, keepalive_seconds=15):
+    """
+    Server-sent events of a performance: an occupancy snapshot, then seat
+    deltas until `max_seconds` pass; the client reconnects after that.
+    """
+    with get_backend().subscribe(performance.id) as subscriber:
+        # Subscribed before reading the tickets, so no delta falls between.
+        snapshot = _event("snapshot", seat_map(performance))
+        # Deltas come from the backend: give the database connections back
+        # instead of holding them idle for the whole stream
+        for connection in connections.all(initialized_only=True):
+            if not connection.in_atomic_block:
+                connection.close()
+        yield b"retry: 3000\n" + snapshot
+        deadline = time.monotonic() + max_seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                event = subscriber.get(timeout=min(keepalive_seconds, remaining))
+            except queue.Empty:
+                yield b": keepalive\n\n"
+                continue
+            if event is RESYNC:
+                break
+            yield _event("seats", event)
@@ -1,7 +1,17 @@
+from collections import defaultdict
+from functools import partial
+from operator import itemgetter
+
+from django.core.files.storage import default_storage
 from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from drf_spectacular.utils import extend_schema_field, inline_serializer
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from catalog.analytics import GROUPINGS
+from catalog.bookings import record_reservation
+from catalog.layouts import validate_layout_fits
 from catalog.models import (
     Actor,
     Genre,
@@ -10,28 +20,73 @@ from catalog.models import (
     Performance,
     Ticket,
     Reservation,
+    ScheduleEntry,
+    BookingSummary,
+    BookingRequest,
 )
-
-
-class ActorSerializer(serializers.ModelSerializer):
+from catalog.pricing import price_tables, reservation_total, ticket_price
+
+
+# Keep only the fields named in the "fields" context and render the expandable
+# relations missing from "expand" as primary keys. Either context value set to
+# None keeps the default. Applies to the top-level serializer only, nested ones
+# keep their fields.
+class SparseFieldsMixin:
+    expandable_fields = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if parent is not None and not (
+            isinstance(parent, serializers.ListSerializer) and parent.parent is None
+        ):
+            return fields
+
+        requested = self.context.get("fields")
+        if requested is not None:
+            for name in list(fields):
+                if name not in requested:
+                    fields.pop(name)
+
+        expand = self.context.get("expand")
+        if expand is not None:
+            for name in self.expandable_fields:
+                if name in fields and name not in expand:
+                    fields[name] = serializers.PrimaryKeyRelatedField(
+                        many=isinstance(fields[name], serializers.ListSerializer),
+                        read_only=True,
+                    )
+        return fields
+
+
+class ActorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Actor
         fields = ("id", "first_name", "last_name", "full_name")
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ("id", "name")
 
 
-class TheatreHallSerializer(serializers.ModelSerializer):
+class TheatreHallSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TheatreHall
-        fields = ("id", "name", "rows", "seats_in_row", "capacity")
+        fields = ("id", "name", "rows", "seats_in_row", "capacity", "layout")
+
+    def validate(self, attrs):
+        hall = self.instance
+        validate_layout_fits(
+            attrs.get("layout", hall and hall.layout),
+            attrs.get("rows", hall and hall.rows),
+            attrs.get("seats_in_row", hall and hall.seats_in_row),
+        )
+        return attrs
 
 
-class PlaySerializer(serializers.ModelSerializer):
+class PlaySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Play
         fields = (
@@ -58,6 +113,8 @@ class PlayDetailSerializer(PlaySerializer):
     genres = GenreSerializer(many=True, read_only=True)
     actors = ActorSerializer(many=True, read_only=True)
 
+    expandable_fields = ("genres", "actors")
+
     class Meta:
         model = Play
         fields = ("id", "title", "description", "genres", "actors", "image")
@@ -69,10 +126,10 @@ class PlayImageSerializer(serializers.ModelSerializer):
         fields = ("id", "image")
 
 
-class PerformanceSerializer(serializers.ModelSerializer):
+class PerformanceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Performance
-        fields = ("id", "play", "theatre_hall", "show_time")
+        fields = ("id", "play", "theatre_hall", "show_time", "queued_booking")
 
 
 class PerformanceListSerializer(PerformanceSerializer):
@@ -112,10 +169,83 @@ class TicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "performance")
+        # validate() reads the hall, fetch it along with the performance
+        extra_kwargs = {
+            "performance": {
+                "queryset": Performance.objects.select_related("theatre_hall")
+            }
+        }
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field resolving ids from `prefetched` before querying"""
+
+    prefetched = None
+
+    def to_internal_value(self, data):
+        if self.prefetched and type(data) is int and data in self.prefetched:
+            return self.prefetched[data]
+        return super().to_internal_value(data)
+
+
+class TicketBatchListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            ids = {
+                item.get("performance")
+                for item in data
+                if isinstance(item, dict) and type(item.get("performance")) is int
+            }
+            self.child.fields["performance"].prefetched = (
+                Performance.objects.select_related("theatre_hall").in_bulk(ids)
+            )
+        return super().to_internal_value(data)
+
+
+# Ticket of a reservation: performances are fetched in one query and the seats
+# checked together by ReservationSerializer.validate_tickets().
+class TicketBatchSerializer(TicketSerializer):
+    performance = PrefetchedPrimaryKeyRelatedField(
+        queryset=Performance.objects.select_related("theatre_hall")
+    )
+
+    def validate(self, attrs):
+        return attrs
+
+    class Meta(TicketSerializer.Meta):
+        validators = []
+        list_serializer_class = TicketBatchListSerializer
+
+
+def _price_tables(context, performances):
+    """Price tables memoized on the serializer context for the whole response"""
+    return price_tables(performances, context.setdefault("price_tables", {}))
+
+
+class PriceField(serializers.DecimalField):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("max_digits", 10)
+        kwargs.setdefault("decimal_places", 2)
+        super().__init__(read_only=True, allow_null=True, source="*", **kwargs)
+
+
+class TicketPriceField(PriceField):
+    """Price of the ticket's zone from its performance's price table"""
+
+    def get_attribute(self, ticket):
+        return ticket_price(ticket, _price_tables(self.context, [ticket.performance]))
+
+
+class ReservationTotalField(PriceField):
+    def get_attribute(self, reservation):
+        tickets = reservation.all_tickets
+        tables = _price_tables(self.context, [t.performance for t in tickets])
+        return reservation_total(tickets, tables)
 
 
 class TicketListSerializer(serializers.ModelSerializer):
     performance = PerformanceSerializer(many=False, read_only=True)
+    price = TicketPriceField()
 
     class Meta:
         model = Ticket
@@ -124,6 +254,7 @@ class TicketListSerializer(serializers.ModelSerializer):
             "row",
             "seat",
             "performance",
+            "price",
         )
 
 
@@ -141,13 +272,15 @@ class PerformanceDetailSerializer(PerformanceSerializer):
     theatre_hall = TheatreHallSerializer(many=False, read_only=True)
     taken_place = TicketSeatSerializer(source="tickets", many=True, read_only=True)
 
+    expandable_fields = ("play", "theatre_hall")
+
     class Meta:
         model = Performance
         fields = ("id", "play", "theatre_hall", "taken_place")
 
 
 class ReservationSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, allow_empty=False)
+    tickets = TicketBatchSerializer(many=True, allow_empty=False)
 
     class Meta:
         model = Reservation
@@ -157,14 +290,341 @@ class ReservationSerializer(serializers.ModelSerializer):
             "created_at",
         )
 
+    def validate_tickets(self, tickets):
+        errors = Ticket.validate_seats(
+            [
+                (ticket["performance"], ticket["row"], ticket["seat"])
+                for ticket in tickets
+            ]
+        )
+        if any(errors):
+            raise ValidationError(errors)
+
+        performances = {ticket["performance"] for ticket in tickets}
+        if len(performances) > 1 and any(
+            performance.queued_booking for performance in performances
+        ):
+            raise ValidationError(
+                "Tickets of a queued-booking performance must be reserved "
+                "separately from other performances."
+            )
+        return tickets
+
+    @property
+    def queued_performance(self):
+        """Performance whose booking queue takes this reservation, if any"""
+        performance = self.validated_data["tickets"][0]["performance"]
+        return performance if performance.queued_booking else None
+
     @transaction.atomic
     def create(self, validated_data):
         tickets_data = validated_data.pop("tickets")
         reservation = Reservation.objects.create(**validated_data)
+        tickets = []
         for ticket_data in tickets_data:
-            Ticket.objects.create(reservation=reservation, **ticket_data)
+            # Seat ranges and uniqueness were checked by validate_tickets()
+            ticket = Ticket(reservation=reservation, **ticket_data)
+            ticket.save(validated=True)
+            tickets.append(ticket)
+        record_reservation(reservation, tickets)
         return reservation
 
 
+class PricedReservationListSerializer(serializers.ListSerializer):
+    """Load the price tables of a whole page of reservations at once"""
+
+    def to_representation(self, data):
+        reservations = list(data.all() if hasattr(data, "all") else data)
+        _price_tables(
+            self.context,
+            [
+                ticket.performance
+                for reservation in reservations
+                for ticket in reservation.all_tickets
+            ],
+        )
+        return super().to_representation(reservations)
+
+
 class ReservationListSerializer(ReservationSerializer):
-    tickets = TicketListSerializer(many=True, read_only=True)
+    tickets = TicketListSerializer(source="all_tickets", many=True, read_only=True)
+    total = ReservationTotalField()
+
+    class Meta(ReservationSerializer.Meta):
+        fields = ReservationSerializer.Meta.fields + ("total",)
+        list_serializer_class = PricedReservationListSerializer
+
+
+class ScheduleEntrySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(source="performance_id", read_only=True)
+    play_image = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ScheduleEntry
+        fields = (
+            "id",
+            "show_time",
+            "play_id",
+            "play_title",
+            "play_image",
+            "genres",
+            "theatre_hall_name",
+            "theatre_hall_capacity",
+            "tickets_available",
+        )
+
+    def get_play_image(self, obj):
+        if not obj.play_image:
+            return None
+        url = default_storage.url(obj.play_image)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class BookingSummarySerializer(serializers.ModelSerializer):
+    upcoming_tickets = serializers.SerializerMethodField()
+    next_performance = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BookingSummary
+        fields = (
+            "total_reservations",
+            "total_tickets",
+            "upcoming_tickets",
+            "next_performance",
+        )
+
+    def get_upcoming_tickets(self, obj) -> int:
+        return sum(tickets for _, _, tickets in obj.upcoming)
+
+    @extend_schema_field(
+        inline_serializer(
+            "NextPerformance",
+            {
+                "id": serializers.IntegerField(),
+                "show_time": serializers.DateTimeField(),
+            },
+        )
+    )
+    def get_next_performance(self, obj):
+        if not obj.upcoming:
+            return None
+        performance_id, show_time, _ = obj.upcoming[0]
+        # Summaries store ISO strings; render like any other DateTimeField
+        return {
+            "id": performance_id,
+            "show_time": serializers.DateTimeField().to_representation(
+                parse_datetime(show_time)
+            ),
+        }
+
+
+class BatchSerializer(serializers.Serializer):
+    max_batch_size = 100
+
+    performance = serializers.ListField(
+        child=serializers.IntegerField(), required=False
+    )
+    play = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate(self, attrs):
+        if sum(len(ids) for ids in attrs.values()) > self.max_batch_size:
+            raise ValidationError(
+                f"At most {self.max_batch_size} ids per batch request"
+            )
+        return attrs
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    """
+    Read-only list serializer for the compiled serializers below: the child
+    turns the queryset into plain rows once, then builds each dict directly.
+    """
+
+    def to_representation(self, data):
+        return list(self.iter_representation(data))
+
+    def iter_representation(self, data):
+        rows = self.child.get_rows(data)
+        if hasattr(rows, "iterator"):
+            rows = rows.iterator(chunk_size=1000)
+        for row in rows:
+            yield self.child.to_representation(row)
+
+
+class CompiledListSerializer(serializers.BaseSerializer):
+    """
+    Output-identical replacement of a ModelSerializer for large list pages,
+    skipping per-field serializer machinery and attribute walking. Only the
+    columns of the fields requested in the "fields" context are selected.
+    """
+
+    # (output field, source columns, converter method name or None)
+    columns = ()
+
+    class Meta:
+        list_serializer_class = ValuesListSerializer
+
+    def get_rows(self, queryset):
+        requested = self.context.get("fields")
+        selected = [
+            column
+            for column in self.columns
+            if requested is None or column[0] in requested
+        ]
+        sources = list(
+            dict.fromkeys(
+                ["id"] + [source for _, sources, _ in selected for source in sources]
+            )
+        )
+
+        self._getters = []
+        for name, column_sources, converter in selected:
+            indexes = [sources.index(source) for source in column_sources]
+            if converter is None:
+                getter = itemgetter(indexes[0])
+            else:
+                getter = partial(
+                    self._convert, getattr(self, converter), itemgetter(*indexes)
+                )
+            self._getters.append((name, getter))
+
+        return self.load_related(
+            queryset.values_list(*sources), {name for name, _, _ in selected}
+        )
+
+    @staticmethod
+    def _convert(converter, getter, row):
+        values = getter(row)
+        return converter(*values) if isinstance(values, tuple) else converter(values)
+
+    def load_related(self, rows, selected):
+        return rows
+
+    def to_representation(self, row):
+        return {name: getter(row) for name, getter in self._getters}
+
+    def image_url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class PerformanceListCompiledSerializer(CompiledListSerializer):
+    """Same output as PerformanceListSerializer"""
+
+    columns = (
+        ("id", ("id",), None),
+        ("play_title", ("play__title",), None),
+        ("play_image", ("play__image",), "image_url"),
+        ("theatre_hall_name", ("theatre_hall__name",), None),
+        ("theatre_hall_capacity", ("theatre_hall__seat_count",), None),
+        ("tickets_available", ("tickets_available",), None),
+    )
+
+
+class PlayListCompiledSerializer(CompiledListSerializer):
+    """Same output as PlayListSerializer"""
+
+    columns = (
+        ("id", ("id",), None),
+        ("title", ("title",), None),
+        ("genres", ("id",), "genre_names"),
+        ("actors", ("id",), "actor_names"),
+        ("image", ("image",), "image_url"),
+    )
+
+    def load_related(self, rows, selected):
+        rows = list(rows)
+        play_ids = [row[0] for row in rows]
+        self._genres = defaultdict(list)
+        self._actors = defaultdict(list)
+        if "genres" in selected:
+            for play_id, name in Play.genres.through.objects.filter(
+                play_id__in=play_ids
+            ).values_list("play_id", "genre__name"):
+                self._genres[play_id].append(name)
+        if "actors" in selected:
+            for play_id, first_name, last_name in Play.actors.through.objects.filter(
+                play_id__in=play_ids
+            ).values_list("play_id", "actor__first_name", "actor__last_name"):
+                self._actors[play_id].append(f"{first_name} {last_name}")
+        return rows
+
+    def genre_names(self, play_id):
+        return self._genres.get(play_id, [])
+
+    def actor_names(self, play_id):
+        return self._actors.get(play_id, [])
+
+
+class DateRangeQuerySerializer(serializers.Serializer):
+    """
+    ?from= and ?to= query parameters as dates, validated as date_from and
+    date_to; errors keep the parameter names.
+    """
+
+    def get_fields(self):
+        # "from" is a keyword, so these can't be declared as attributes
+        fields = super().get_fields()
+        fields["from"] = serializers.DateField(source="date_from", required=False)
+        fields["to"] = serializers.DateField(source="date_to", required=False)
+        return fields
+
+    def query_data(self, data):
+        return {param: data[param] for param in ("from", "to") if data.get(param)}
+
+    def to_internal_value(self, data):
+        return super().to_internal_value(self.query_data(data))
+
+
+class SalesReportQuerySerializer(DateRangeQuerySerializer):
+    group_by = serializers.ListField(
+        child=serializers.ChoiceField(choices=list(GROUPINGS)),
+        allow_empty=False,
+    )
+
+    def query_data(self, data):
+        return {
+            "group_by": [
+                name for name in data.get("group_by", "day").split(",") if name
+            ],
+            **super().query_data(data),
+        }
+
+
+class SalesReportSerializer(serializers.Serializer):
+    performance_id = serializers.IntegerField(required=False)
+    show_time = serializers.DateTimeField(required=False)
+    play_id = serializers.IntegerField(required=False)
+    play_title = serializers.CharField(required=False)
+    theatre_hall_id = serializers.IntegerField(required=False)
+    theatre_hall_name = serializers.CharField(required=False)
+    day = serializers.DateField(required=False)
+    performances = serializers.IntegerField()
+    tickets_sold = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    occupancy = serializers.SerializerMethodField()
+
+    def get_occupancy(self, row) -> float:
+        if not row["capacity"]:
+            return 0.0
+        return round(row["tickets_sold"] / row["capacity"], 4)
+
+
+class BookingRequestSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BookingRequest
+        fields = (
+            "id",
+            "performance",
+            "seats",
+            "status",
+            "reservation",
+            "error",
+            "created_at",
+            "processed_at",
+        )
+        read_only_fields = fields
@@ -0,0 +1,146 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from catalog.bookings import rebuild_booking_summaries
+from catalog.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    PriceTier,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from catalog.pricing import invalidate_price_table
+from catalog.schedule import schedule_refresh
+from catalog.search import invalidate_actor_index, refresh_search_documents
+from catalog.seat_events import publish_seat_change
+
+
+def _upcoming_ids(**filters):
+    return Performance.objects.filter(
+        show_time__gte=timezone.now(), **filters
+    ).values_list("id", flat=True)
+
+
+@receiver(post_save, sender=Performance)
+def refresh_performance_schedule(sender, instance, **kwargs):
+    schedule_refresh([instance.id])
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def refresh_ticket_schedule(sender, instance, **kwargs):
+    schedule_refresh([instance.performance_id])
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def publish_ticket_seat_change(sender, instance, **kwargs):
+    publish_seat_change(instance.performance_id, [(instance.row, instance.seat)])
+
+
+@receiver(post_save, sender=Play)
+def refresh_play_schedule(sender, instance, created, **kwargs):
+    if not created:
+        schedule_refresh(_upcoming_ids(play=instance))
+
+
+@receiver(m2m_changed, sender=Play.genres.through)
+def refresh_play_genres_schedule(sender, instance, action, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if isinstance(instance, Play):
+        schedule_refresh(_upcoming_ids(play=instance))
+    else:
+        schedule_refresh(_upcoming_ids(play__genres=instance))
+
+
+@receiver(post_save, sender=Genre)
+def refresh_genre_schedule(sender, instance, created, **kwargs):
+    if not created:
+        schedule_refresh(_upcoming_ids(play__genres=instance))
+
+
+@receiver(post_save, sender=TheatreHall)
+def refresh_theatre_hall_schedule(sender, instance, created, **kwargs):
+    if not created:
+        schedule_refresh(_upcoming_ids(theatre_hall=instance))
+
+
+@receiver(post_save, sender=Play)
+def rename_play_performances(sender, instance, created, **kwargs):
+    if not created:
+        Performance.objects.filter(play=instance).exclude(
+            play_title=instance.title
+        ).update(play_title=instance.title)
+
+
+@receiver(post_save, sender=TheatreHall)
+def rename_theatre_hall_performances(sender, instance, created, **kwargs):
+    if not created:
+        Performance.objects.filter(theatre_hall=instance).exclude(
+            theatre_hall_name=instance.name
+        ).update(theatre_hall_name=instance.name)
+
+
+@receiver(post_save, sender=Play)
+def refresh_play_search_document(sender, instance, **kwargs):
+    refresh_search_documents([instance.id])
+
+
+@receiver(m2m_changed, sender=Play.actors.through)
+@receiver(m2m_changed, sender=Play.genres.through)
+def refresh_play_relations_search_document(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if reverse and action == "pre_clear":
+        instance._cleared_play_ids = list(instance.plays.values_list("id", flat=True))
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        refresh_search_documents([instance.id])
+    elif action == "post_clear":
+        refresh_search_documents(instance.__dict__.pop("_cleared_play_ids", []))
+    else:
+        refresh_search_documents(pk_set)
+
+
+@receiver(post_save, sender=Actor)
+@receiver(post_save, sender=Genre)
+def refresh_people_search_documents(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(instance.plays.values_list("id", flat=True))
+
+
+@receiver(post_save, sender=Actor)
+@receiver(post_delete, sender=Actor)
+def refresh_actor_index(sender, **kwargs):
+    invalidate_actor_index()
+
+
+@receiver(post_delete, sender=Reservation)
+def rebuild_reservation_booking_summary(sender, instance, **kwargs):
+    transaction.on_commit(partial(rebuild_booking_summaries, [instance.user_id]))
+
+
+@receiver(post_save, sender=Performance)
+def rebuild_performance_booking_summaries(sender, instance, created, **kwargs):
+    if not created:
+        user_ids = list(
+            Reservation.objects.filter(tickets__performance=instance)
+            .values_list("user_id", flat=True)
+            .distinct()
+        )
+        transaction.on_commit(partial(rebuild_booking_summaries, user_ids))
+
+
+@receiver(post_save, sender=PriceTier)
+@receiver(post_delete, sender=PriceTier)
+def invalidate_performance_prices(sender, instance, **kwargs):
+    invalidate_price_table(instance.performance_id)
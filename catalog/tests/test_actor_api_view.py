@@ -2,6 +2,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 from catalog.models import Actor
+from catalog.search import invalidate_actor_index, search_actor_ids
 from catalog.serializers import ActorSerializer
 from django.contrib.auth import get_user_model
 
@@ -67,3 +68,60 @@ class PrivateActorApiTests(APITestCase):
         serializer = ActorSerializer(actor)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
+
+
+class ActorLookupApiTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("test@test.com", "password123")
+        self.client.force_authenticate(self.user)
+        self.grisi = Actor.objects.create(first_name="Carlotta", last_name="Grisi")
+        self.carlsson = Actor.objects.create(first_name="Anna", last_name="Carlsson")
+        Actor.objects.create(first_name="Jules", last_name="Perrot")
+
+    def test_lookup_by_prefix(self):
+        res = self.client.get(ACTOR_URL, {"q": "carl"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {actor["id"] for actor in res.data}, {self.grisi.id, self.carlsson.id}
+        )
+
+    def test_lookup_ranks_full_name_first(self):
+        res = self.client.get(ACTOR_URL, {"q": "carlotta gri"})
+
+        self.assertEqual(res.data[0], ActorSerializer(self.grisi).data)
+        self.assertEqual(len(res.data), 1)
+
+    def test_lookup_tolerates_typos(self):
+        res = self.client.get(ACTOR_URL, {"q": "perot"})
+
+        self.assertEqual([actor["last_name"] for actor in res.data], ["Perrot"])
+
+    def test_lookup_follows_renames(self):
+        self.grisi.last_name = "Zambelli"
+        self.grisi.save()
+
+        res = self.client.get(ACTOR_URL, {"q": "zamb"})
+
+        self.assertEqual([actor["id"] for actor in res.data], [self.grisi.id])
+
+    def test_lookup_limit(self):
+        res = self.client.get(ACTOR_URL, {"q": "carl", "limit": 1})
+
+        self.assertEqual(len(res.data), 1)
+
+    def test_lookup_rejects_invalid_limit(self):
+        for limit in ("abc", "-3", "0"):
+            res = self.client.get(ACTOR_URL, {"q": "carl", "limit": limit})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("limit", res.data)
+
+    def test_lookup_sees_renames_from_other_processes(self):
+        search_actor_ids("carl", 10)
+        # Another process renamed the actor and bumped the shared version
+        Actor.objects.filter(id=self.grisi.id).update(last_name="Taglioni")
+        invalidate_actor_index()
+
+        self.assertEqual(search_actor_ids("taglioni", 10), [self.grisi.id])
@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from catalog.models import Performance, Play, Reservation, TheatreHall, Ticket
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@admin.com", password="test12345"
+        )
+        self.client.force_login(self.admin)
+        self.hall = TheatreHall.objects.create(name="Blue", rows=20, seats_in_row=20)
+        self.play = Play.objects.create(title="Giselle", description="Ballet")
+
+    def seed(self, count):
+        for _ in range(count):
+            performance = Performance.objects.create(
+                play=self.play, theatre_hall=self.hall, show_time=timezone.now()
+            )
+            reservation = Reservation.objects.create(user=self.admin)
+            for seat in range(1, 4):
+                Ticket.objects.create(
+                    row=1, seat=seat, performance=performance, reservation=reservation
+                )
+
+    def changelist_queries(self, model_name):
+        url = reverse(f"admin:catalog_{model_name}_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(queries)
+
+    def assert_constant_queries(self, model_name, expected):
+        self.seed(2)
+        self.assertEqual(self.changelist_queries(model_name), expected)
+        self.seed(10)
+        self.assertEqual(self.changelist_queries(model_name), expected)
+
+    def test_ticket_changelist(self):
+        self.assert_constant_queries("ticket", 4)
+
+    def test_reservation_changelist(self):
+        self.assert_constant_queries("reservation", 4)
+
+    def test_performance_changelist(self):
+        # theatre hall filter choices + date hierarchy bounds and days
+        self.assert_constant_queries("performance", 7)
+
+    def test_ticket_change_page_labels_performance(self):
+        self.seed(1)
+        ticket = Ticket.objects.first()
+
+        res = self.client.get(reverse("admin:catalog_ticket_change", args=[ticket.id]))
+
+        self.assertContains(res, "Performance: Giselle at Blue")
+        # raw id widget label
+        self.assertContains(res, '/change/">Giselle at Blue on')
+        self.assertNotContains(res, "#%d at" % self.play.id)
+
+    def test_reservation_change_page_labels_ticket_performances(self):
+        self.seed(1)
+        reservation = Reservation.objects.first()
+
+        res = self.client.get(
+            reverse("admin:catalog_reservation_change", args=[reservation.id])
+        )
+
+        self.assertContains(res, "Performance: Giselle at Blue", count=3)
+        self.assertContains(res, '/change/">Giselle at Blue on', count=3)
+        self.assertNotContains(res, "#%d at" % self.play.id)
+
+    def test_performance_change_page_labels_performance(self):
+        self.seed(1)
+        performance = Performance.objects.first()
+
+        res = self.client.get(
+            reverse("admin:catalog_performance_change", args=[performance.id])
+        )
+
+        self.assertContains(res, "Giselle at Blue on")
+        self.assertNotContains(res, "#%d at" % self.play.id)
+
+    def test_play_delete_confirmation_labels_performances(self):
+        self.seed(2)
+
+        res = self.client.get(reverse("admin:catalog_play_delete", args=[self.play.id]))
+
+        self.assertContains(res, "Giselle at Blue on")
+        self.assertNotContains(res, "#%d at" % self.play.id)
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from catalog.models import (
+    ArchivedTicket,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+RESERVATION_URL = reverse("catalog:reservation-list")
+
+
+class ArchiveTicketsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        hall = TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=10)
+        self.old = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now() - timedelta(days=400)
+        )
+        self.upcoming = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now() + timedelta(days=1)
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+        for seat in range(1, 4):
+            Ticket.objects.create(
+                row=1, seat=seat, performance=self.old, reservation=self.reservation
+            )
+        Ticket.objects.create(
+            row=2, seat=1, performance=self.upcoming, reservation=self.reservation
+        )
+
+    def archive(self, **options):
+        call_command("archive_tickets", stdout=StringIO(), **options)
+
+    def test_old_tickets_are_moved_in_batches(self):
+        self.archive(days=365, batch_size=2)
+
+        self.assertEqual(
+            list(Ticket.objects.values_list("performance", flat=True)),
+            [self.upcoming.id],
+        )
+        self.assertEqual(ArchivedTicket.objects.filter(performance=self.old).count(), 3)
+
+    def test_negative_days_are_rejected(self):
+        with self.assertRaises(CommandError):
+            self.archive(days=-1)
+
+        self.assertEqual(Ticket.objects.count(), 4)
+
+    def test_archiving_is_resumable(self):
+        self.archive(days=365)
+        self.archive(days=365)
+
+        self.assertEqual(ArchivedTicket.objects.count(), 3)
+
+    def test_reservation_history_includes_archived_tickets(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        before = client.get(RESERVATION_URL).data
+
+        self.archive(days=365)
+        after = client.get(RESERVATION_URL).data
+
+        self.assertEqual(before, after)
+        self.assertEqual(len(after["results"][0]["tickets"]), 4)
+
+    @mock.patch("catalog.signals.schedule_refresh")
+    @mock.patch("catalog.signals.publish_seat_change")
+    def test_archiving_publishes_no_seat_events(
+        self, publish_seat_change, schedule_refresh
+    ):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.archive(days=365)
+
+        publish_seat_change.assert_not_called()
+        schedule_refresh.assert_not_called()
+        self.assertEqual(ArchivedTicket.objects.count(), 3)
@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.models import Genre, Performance, Play, TheatreHall
+
+PERFORMANCE_URL = reverse("catalog:performance-list")
+PLAY_URL = reverse("catalog:play-list")
+BATCH_URL = reverse("catalog:batch")
+
+
+class BatchApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+        hall = TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=10)
+        genre = Genre.objects.create(name="Ballet")
+        self.plays = [
+            Play.objects.create(title=f"Play {index}", description="")
+            for index in range(3)
+        ]
+        for play in self.plays:
+            play.genres.add(genre)
+        self.performances = [
+            Performance.objects.create(
+                play=play, theatre_hall=hall, show_time=timezone.now()
+            )
+            for play in self.plays
+        ]
+
+    def test_list_performances_by_ids(self):
+        ids = [self.performances[0].id, self.performances[2].id]
+
+        with self.assertNumQueries(1):
+            res = self.client.get(PERFORMANCE_URL, {"ids": f"{ids[0]},{ids[1]}"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual({item["id"] for item in res.data}, set(ids))
+
+    def test_list_plays_by_ids(self):
+        res = self.client.get(PLAY_URL, {"ids": str(self.plays[1].id)})
+
+        self.assertEqual([item["title"] for item in res.data], ["Play 1"])
+
+    def test_invalid_ids(self):
+        res = self.client.get(PERFORMANCE_URL, {"ids": "1,a"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_too_many_ids(self):
+        ids = ",".join(str(index) for index in range(101))
+
+        res = self.client.get(PERFORMANCE_URL, {"ids": ids})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_endpoint(self):
+        payload = {
+            "performance": [performance.id for performance in self.performances],
+            "play": [self.plays[0].id, self.plays[1].id],
+        }
+
+        with self.assertNumQueries(4):
+            res = self.client.post(BATCH_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["performance"]), 3)
+        self.assertEqual(
+            {play["title"] for play in res.data["play"]}, {"Play 0", "Play 1"}
+        )
+        self.assertEqual(res.data["play"][0]["genres"], ["Ballet"])
+
+    def test_batch_size_limit(self):
+        res = self.client.post(
+            BATCH_URL, {"performance": list(range(101))}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
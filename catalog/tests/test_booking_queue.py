@@ -0,0 +1,184 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.booking_queue import (
+    SeatMap,
+    acquire_worker_lock,
+    process_booking_queue,
+    release_worker_lock,
+)
+from catalog.models import (
+    BookingRequest,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+RESERVATION_URL = reverse("catalog:reservation-list")
+
+
+def booking_request_url(booking_id):
+    return reverse("catalog:bookingrequest-detail", args=[booking_id])
+
+
+class BookingQueueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+
+        hall = TheatreHall.objects.create(name="Blue", rows=5, seats_in_row=5)
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        self.queued = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now(), queued_booking=True
+        )
+        self.direct = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now()
+        )
+
+    def reserve(self, *tickets):
+        return self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": row, "seat": seat, "performance": performance.id}
+                    for performance, row, seat in tickets
+                ]
+            },
+            format="json",
+        )
+
+    def test_queued_reservation_is_accepted_then_confirmed(self):
+        res = self.reserve((self.queued, 1, 1), (self.queued, 1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data["status"], BookingRequest.PENDING)
+        self.assertTrue(res["Location"].endswith(booking_request_url(res.data["id"])))
+        self.assertFalse(Reservation.objects.exists())
+
+        self.assertEqual(process_booking_queue(self.queued.id), 1)
+
+        res = self.client.get(booking_request_url(res.data["id"]), {"wait": 1})
+        self.assertEqual(res.data["status"], BookingRequest.CONFIRMED)
+        reservation = Reservation.objects.get(id=res.data["reservation"])
+        self.assertEqual(reservation.user, self.user)
+        self.assertEqual(reservation.tickets.count(), 2)
+
+    def test_requests_are_served_in_arrival_order(self):
+        first = self.reserve((self.queued, 2, 2)).data["id"]
+        second = self.reserve((self.queued, 2, 2), (self.queued, 2, 3)).data["id"]
+        third = self.reserve((self.queued, 2, 3)).data["id"]
+
+        process_booking_queue(self.queued.id, batch_size=2)
+
+        statuses = dict(BookingRequest.objects.values_list("id", "status"))
+        self.assertEqual(statuses[first], BookingRequest.CONFIRMED)
+        self.assertEqual(statuses[second], BookingRequest.REJECTED)
+        self.assertEqual(statuses[third], BookingRequest.CONFIRMED)
+        self.assertEqual(Ticket.objects.filter(performance=self.queued).count(), 2)
+
+    def test_direct_performance_books_immediately(self):
+        res = self.reserve((self.direct, 1, 1))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(BookingRequest.objects.exists())
+
+    def test_queued_and_direct_tickets_cannot_be_mixed(self):
+        res = self.reserve((self.queued, 1, 1), (self.direct, 1, 1))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_pending_request_without_wait(self):
+        booking_id = self.reserve((self.queued, 1, 1)).data["id"]
+
+        res = self.client.get(booking_request_url(booking_id))
+
+        self.assertEqual(res.data["status"], BookingRequest.PENDING)
+
+    def test_long_poll_backs_off_to_max_interval(self):
+        booking_id = self.reserve((self.queued, 1, 1)).data["id"]
+        clock = iter(range(100))
+
+        with mock.patch(
+            "catalog.views.time.monotonic", side_effect=lambda: next(clock)
+        ), mock.patch("catalog.views.time.sleep") as sleep:
+            res = self.client.get(booking_request_url(booking_id), {"wait": 10})
+
+        self.assertEqual(res.data["status"], BookingRequest.PENDING)
+        intervals = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(intervals[:4], [0.2, 0.4, 0.8, 1.0])
+        self.assertEqual(max(intervals), 1.0)
+
+    def test_other_users_cannot_see_request(self):
+        booking_id = self.reserve((self.queued, 1, 1)).data["id"]
+        other = get_user_model().objects.create_user(
+            email="other@test.com", password="test12345"
+        )
+        self.client.force_authenticate(other)
+
+        res = self.client.get(booking_request_url(booking_id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_worker_command_skips_locked_performance(self):
+        self.reserve((self.queued, 1, 1))
+        acquire_worker_lock(self.queued.id, 60)
+
+        call_command("run_booking_queue", once=True, stdout=StringIO())
+        self.assertEqual(BookingRequest.objects.get().status, BookingRequest.PENDING)
+
+        release_worker_lock(self.queued.id)
+        call_command("run_booking_queue", once=True, stdout=StringIO())
+        self.assertEqual(BookingRequest.objects.get().status, BookingRequest.CONFIRMED)
+
+    def test_worker_lock_is_exclusive_until_it_expires(self):
+        self.assertTrue(acquire_worker_lock(self.queued.id, 60))
+        self.assertFalse(acquire_worker_lock(self.queued.id, 60))
+        self.assertTrue(acquire_worker_lock(self.direct.id, 60))
+
+        with mock.patch("catalog.booking_queue.time.time", return_value=2e9):
+            self.assertTrue(acquire_worker_lock(self.queued.id, 60))
+
+    def test_worker_survives_repeated_seat_collisions(self):
+        self.reserve((self.queued, 1, 1))
+        stderr = StringIO()
+
+        with mock.patch(
+            "catalog.booking_queue._process_batch", side_effect=IntegrityError
+        ):
+            call_command(
+                "run_booking_queue", once=True, stdout=StringIO(), stderr=stderr
+            )
+
+        self.assertIn(f"performance {self.queued.id}", stderr.getvalue())
+        self.assertEqual(BookingRequest.objects.get().status, BookingRequest.PENDING)
+        self.assertTrue(acquire_worker_lock(self.queued.id, 60))
+
+    def test_seat_map_claims_all_or_nothing(self):
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.queued,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+        seat_map = SeatMap(self.queued)
+
+        self.assertFalse(seat_map.claim([[1, 2], [1, 1]]))
+        self.assertFalse(seat_map.claim([[1, 3], [1, 3]]))
+        self.assertTrue(seat_map.claim([[1, 2], [1, 3]]))
+        self.assertFalse(seat_map.claim([[1, 3]]))
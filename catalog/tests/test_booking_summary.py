@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.test import APIClient
+
+from catalog.models import (
+    BookingSummary,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+RESERVATION_URL = reverse("catalog:reservation-list")
+SUMMARY_URL = reverse("catalog:reservation-summary")
+UPCOMING_URL = reverse("catalog:reservation-upcoming")
+PAST_URL = reverse("catalog:reservation-past")
+
+
+class BookingSummaryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+
+        hall = TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=10)
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        self.future = Performance.objects.create(
+            play=play,
+            theatre_hall=hall,
+            show_time=timezone.now() + timedelta(days=3),
+        )
+        self.past = Performance.objects.create(
+            play=play,
+            theatre_hall=hall,
+            show_time=timezone.now() - timedelta(days=3),
+        )
+
+    def _reserve(self, performance, *seats):
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": seat, "performance": performance.id}
+                for seat in seats
+            ]
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(RESERVATION_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return Reservation.objects.get(id=res.data["id"])
+
+    def test_reservation_updates_summary(self):
+        self._reserve(self.future, 1, 2)
+        self._reserve(self.past, 1)
+
+        res = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["total_reservations"], 2)
+        self.assertEqual(res.data["total_tickets"], 3)
+        self.assertEqual(res.data["upcoming_tickets"], 2)
+        self.assertEqual(res.data["next_performance"]["id"], self.future.id)
+        self.assertEqual(
+            res.data["next_performance"]["show_time"],
+            serializers.DateTimeField().to_representation(self.future.show_time),
+        )
+        self.assertTrue(res.data["next_performance"]["show_time"].endswith("Z"))
+
+    def test_summary_built_for_existing_reservations(self):
+        reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            reservation=reservation, performance=self.future, row=2, seat=2
+        )
+
+        res = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(res.data["total_tickets"], 1)
+        self.assertEqual(res.data["upcoming_tickets"], 1)
+        self.assertTrue(BookingSummary.objects.filter(user=self.user).exists())
+
+    def test_reschedule_and_delete_rebuild_summary(self):
+        reservation = self._reserve(self.future, 1)
+
+        self.future.show_time = timezone.now() - timedelta(hours=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.future.save()
+        self.assertIsNone(self.client.get(SUMMARY_URL).data["next_performance"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.delete()
+        self.assertEqual(self.client.get(SUMMARY_URL).data["total_reservations"], 0)
+
+    def test_upcoming_and_past_reservations(self):
+        upcoming = self._reserve(self.future, 1)
+        past = self._reserve(self.past, 1)
+
+        upcoming_res = self.client.get(UPCOMING_URL)
+        past_res = self.client.get(PAST_URL)
+
+        self.assertEqual(upcoming_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [reservation["id"] for reservation in upcoming_res.data["results"]],
+            [upcoming.id],
+        )
+        self.assertEqual(
+            [reservation["id"] for reservation in past_res.data["results"]],
+            [past.id],
+        )
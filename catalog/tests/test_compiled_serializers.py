@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from catalog.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from catalog.serializers import (
+    PerformanceListCompiledSerializer,
+    PerformanceListSerializer,
+    PlayListCompiledSerializer,
+    PlayListSerializer,
+)
+from catalog.views import PerformanceViewSet
+
+PERFORMANCE_URL = reverse("catalog:performance-list")
+PLAY_URL = reverse("catalog:play-list")
+
+
+class CompiledSerializerParityTests(TestCase):
+    def setUp(self):
+        self.context = {"request": Request(APIRequestFactory().get(PERFORMANCE_URL))}
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        hall = TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=12)
+        ballet = Genre.objects.create(name="Ballet")
+        drama = Genre.objects.create(name="Drama")
+        grisi = Actor.objects.create(first_name="Carlotta", last_name="Grisi")
+
+        with_image = Play.objects.create(
+            title="Giselle", description="Ballet", image="uploads/plays/giselle.jpg"
+        )
+        with_image.genres.set([ballet, drama])
+        with_image.actors.set([grisi])
+        Play.objects.create(title="Hamlet", description="Tragedy")
+
+        reservation = Reservation.objects.create(user=user)
+        for play in Play.objects.all():
+            performance = Performance.objects.create(
+                play=play, theatre_hall=hall, show_time=timezone.now()
+            )
+            Ticket.objects.create(
+                row=1, seat=1, performance=performance, reservation=reservation
+            )
+
+    def assertSameJson(self, expected, actual):
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(expected), renderer.render(actual))
+
+    def test_performance_list_parity(self):
+        queryset = PerformanceViewSet.queryset
+
+        self.assertSameJson(
+            PerformanceListSerializer(queryset, many=True, context=self.context).data,
+            PerformanceListCompiledSerializer(
+                queryset, many=True, context=self.context
+            ).data,
+        )
+
+    def test_play_list_parity(self):
+        queryset = Play.objects.all()
+
+        self.assertSameJson(
+            PlayListSerializer(queryset, many=True, context=self.context).data,
+            PlayListCompiledSerializer(queryset, many=True, context=self.context).data,
+        )
+
+    def test_list_endpoints_use_single_queries(self):
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.get())
+
+        with self.assertNumQueries(1):
+            client.get(PERFORMANCE_URL)
+        with self.assertNumQueries(3):
+            client.get(PLAY_URL)
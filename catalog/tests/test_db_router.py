@@ -0,0 +1,153 @@
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.checks import check_shared_cache
+from catalog.db_router import (
+    ReplicaRouter,
+    is_pinned_to_primary,
+    pin_to_primary,
+    use_replica,
+)
+from catalog.models import Genre, Performance, Play, TheatreHall
+
+GENRE_URL = reverse("catalog:genre-list")
+PERFORMANCE_URL = reverse("catalog:performance-list")
+RESERVATION_URL = reverse("catalog:reservation-list")
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def tearDown(self):
+        use_replica(False)
+
+    def test_reads_go_to_primary_by_default(self):
+        self.assertEqual(self.router.db_for_read(Play), "default")
+
+    def test_reads_go_to_replica_when_enabled(self):
+        use_replica()
+        self.assertEqual(self.router.db_for_read(Play), "replica_1")
+
+    def test_writes_always_go_to_primary(self):
+        use_replica()
+        self.assertEqual(self.router.db_for_write(Play), "default")
+
+    def test_migrations_skip_replicas(self):
+        self.assertFalse(self.router.allow_migrate("replica_1", "catalog"))
+        self.assertIsNone(self.router.allow_migrate("default", "catalog"))
+
+
+class ReplicaReadMixinTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_safe_request_uses_replica(self):
+        with mock.patch("catalog.db_router.use_replica") as use_replica_mock:
+            res = self.client.get(PERFORMANCE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        use_replica_mock.assert_any_call()
+
+    def test_reservation_pins_user_to_primary(self):
+        hall = TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=10)
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now()
+        )
+        payload = {"tickets": [{"row": 1, "seat": 1, "performance": performance.id}]}
+
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(is_pinned_to_primary(self.user))
+
+    def test_pinned_user_reads_from_primary(self):
+        pin_to_primary(self.user)
+        with mock.patch("catalog.db_router.use_replica") as use_replica_mock:
+            self.client.get(PERFORMANCE_URL)
+
+        use_replica_mock.assert_called_once_with(False)
+
+
+class ReplicaDatabaseTests(TestCase):
+    """Routing against a real second SQLite database holding other rows"""
+
+    replica = "replica_test"
+
+    def setUp(self):
+        cache.clear()
+        self.replica_dir = tempfile.mkdtemp()
+        connections.settings[self.replica] = {
+            **connections.settings["default"],
+            "NAME": str(Path(self.replica_dir) / "replica.sqlite3"),
+        }
+        call_command("migrate", database=self.replica, verbosity=0)
+        Genre.objects.using(self.replica).create(name="Replica")
+        Genre.objects.create(name="Primary")
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+
+    def tearDown(self):
+        use_replica(False)
+        connections[self.replica].close()
+        del connections[self.replica]
+        del connections.settings[self.replica]
+        shutil.rmtree(self.replica_dir)
+
+    def genre_names(self):
+        with override_settings(DATABASE_REPLICAS=[self.replica]):
+            res = self.client.get(GENRE_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [genre["name"] for genre in res.data]
+
+    def test_reads_come_from_replica(self):
+        self.assertEqual(self.genre_names(), ["Replica"])
+
+    def test_writes_go_to_primary(self):
+        self.user.is_staff = True
+        with override_settings(DATABASE_REPLICAS=[self.replica]):
+            res = self.client.post(GENRE_URL, {"name": "Drama"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Genre.objects.filter(name="Drama").exists())
+        self.assertFalse(
+            Genre.objects.using(self.replica).filter(name="Drama").exists()
+        )
+
+    def test_pinned_user_reads_from_primary(self):
+        pin_to_primary(self.user)
+
+        self.assertEqual(self.genre_names(), ["Primary"])
+
+
+class SharedCacheCheckTests(TestCase):
+    def test_replicas_with_local_cache_warn(self):
+        with override_settings(DATABASE_REPLICAS=["replica_1"]):
+            self.assertEqual(
+                [warning.id for warning in check_shared_cache(None)],
+                ["catalog.W001"],
+            )
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.booking_queue import SeatMap
+from catalog.models import Performance, Play, Reservation, TheatreHall, Ticket
+from catalog.views import PerformanceViewSet
+
+THEATRE_HALL_URL = reverse("catalog:theatrehall-list")
+RESERVATION_URL = reverse("catalog:reservation-list")
+
+# Two zones, an aisle after the third seat and a short last row
+LAYOUT = ["AAA.BB", "AAA.BB", "CC...."]
+
+
+class HallLayoutTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@admin.com", password="test12345", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.hall = TheatreHall.objects.create(
+            name="Blue", rows=3, seats_in_row=6, layout=LAYOUT
+        )
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        self.performance = Performance.objects.create(
+            play=play, theatre_hall=self.hall, show_time=timezone.now()
+        )
+
+    def test_capacity_counts_layout_seats(self):
+        self.assertEqual(self.hall.capacity, 12)
+        self.assertEqual(self.hall.seat_count, 12)
+        self.assertEqual(
+            TheatreHall.objects.create(name="Red", rows=2, seats_in_row=3).capacity,
+            6,
+        )
+
+    def test_tickets_available_uses_layout(self):
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+
+        performance = PerformanceViewSet.queryset.get(id=self.performance.id)
+
+        self.assertEqual(performance.tickets_available, 11)
+
+    def test_reservation_of_missing_seat(self):
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 4, "performance": self.performance.id},
+                {"row": 3, "seat": 2, "performance": self.performance.id},
+            ]
+        }
+
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seat", res.data["tickets"][0])
+        self.assertEqual(res.data["tickets"][1], {})
+
+    def test_seat_map(self):
+        Ticket.objects.create(
+            row=2,
+            seat=5,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+        url = reverse("catalog:performance-seat-map", args=[self.performance.id])
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["layout"], LAYOUT)
+        self.assertEqual(res.data["taken"], [(2, 5)])
+        self.assertEqual(res.data["available"], {"A": 6, "B": 3, "C": 2})
+
+    def test_booking_queue_treats_gaps_as_taken(self):
+        seat_map = SeatMap(self.performance)
+
+        self.assertFalse(seat_map.claim([[1, 4]]))
+        self.assertTrue(seat_map.claim([[1, 5], [3, 2]]))
+
+    def test_create_hall_with_layout(self):
+        res = self.client.post(
+            THEATRE_HALL_URL,
+            {"name": "Green", "rows": 2, "seats_in_row": 4, "layout": ["AA.A", "BBBB"]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["capacity"], 7)
+
+    def test_invalid_layouts(self):
+        for layout in (["AA-A", "BBBB"], ["AAAA"], ["AAAAA", "BBBB"], "AAAA"):
+            res = self.client.post(
+                THEATRE_HALL_URL,
+                {"name": "Green", "rows": 2, "seats_in_row": 4, "layout": layout},
+                format="json",
+            )
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, layout)
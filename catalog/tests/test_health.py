@@ -0,0 +1,89 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from theatre_api_service import health
+
+LIVE_URL = reverse("health-live")
+READY_URL = reverse("health-ready")
+
+
+class HealthTests(TestCase):
+    def setUp(self):
+        health._last_report = (0.0, None)
+        health._migrated = False
+
+    def test_live(self):
+        res = self.client.get(LIVE_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {"status": "ok"})
+
+    def test_ready(self):
+        res = self.client.get(READY_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            res.json()["checks"],
+            {"database": "ok", "cache": "ok", "migrations": "ok"},
+        )
+
+    def test_not_ready_without_database(self):
+        with mock.patch.object(health, "database_ready", return_value=False):
+            res = self.client.get(READY_URL)
+
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(res.json()["checks"]["database"], "unavailable")
+        self.assertEqual(res.json()["checks"]["migrations"], "pending")
+
+    def test_not_ready_with_pending_migrations(self):
+        with mock.patch.object(
+            health, "pending_migrations", return_value=["catalog.9999_new"]
+        ):
+            res = self.client.get(READY_URL)
+
+        self.assertEqual(res.status_code, 503)
+
+    @override_settings(HEALTH_CHECK_CACHE_SECONDS=60)
+    def test_ready_checks_are_reused(self):
+        with mock.patch.object(
+            health, "_run_checks", wraps=health._run_checks
+        ) as run_checks:
+            for _ in range(3):
+                self.client.get(READY_URL)
+
+        self.assertEqual(run_checks.call_count, 1)
+
+
+@mock.patch("theatre_api_service.health.time.sleep")
+class WaitForDbTests(TestCase):
+    def test_backoff(self, sleep):
+        check = mock.Mock(side_effect=[False, False, False, True])
+
+        self.assertEqual(health.wait_until(check), 4)
+        self.assertEqual(
+            [call.args[0] for call in sleep.call_args_list], [0.05, 0.1, 0.2]
+        )
+
+    def test_command_retries_until_available(self, sleep):
+        out = StringIO()
+        with mock.patch(
+            "catalog.management.commands.wait_for_db.database_ready",
+            side_effect=[False, False, True],
+        ):
+            call_command("wait_for_db", stdout=out)
+
+        self.assertIn("Database available!", out.getvalue())
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_command_fails_after_timeout(self, sleep):
+        with mock.patch(
+            "catalog.management.commands.wait_for_db.database_ready",
+            return_value=False,
+        ):
+            with self.assertRaises(CommandError):
+                call_command("wait_for_db", "--timeout", "0", stdout=StringIO())
@@ -0,0 +1,126 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.idempotency import _request_hash
+from catalog.models import (
+    IdempotencyKey,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+)
+from catalog.views import ReservationViewSet
+
+RESERVATION_URL = reverse("catalog:reservation-list")
+
+
+class IdempotentReservationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+
+        hall = TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=10)
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        self.performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now()
+        )
+
+    def payload(self, seat=1):
+        return {
+            "tickets": [{"row": 1, "seat": seat, "performance": self.performance.id}]
+        }
+
+    def reserve(self, seat=1, key="retry-1"):
+        payload = self.payload(seat)
+        return self.client.post(
+            RESERVATION_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retry_replays_first_response(self):
+        first = self.reserve()
+        retry = self.reserve()
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_key_reused_with_other_payload(self):
+        self.reserve(seat=1)
+        res = self.reserve(seat=2)
+
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_in_flight_duplicate_gets_conflict(self):
+        IdempotencyKey.objects.create(
+            user=self.user,
+            key="retry-1",
+            request_hash=_request_hash(mock.Mock(data=self.payload())),
+        )
+
+        with mock.patch.object(ReservationViewSet, "idempotency_wait_seconds", 0):
+            res = self.reserve()
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_abandoned_key_is_taken_over_after_lease(self):
+        IdempotencyKey.objects.create(
+            user=self.user,
+            key="retry-1",
+            request_hash=_request_hash(mock.Mock(data=self.payload())),
+        )
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+
+        with mock.patch.object(ReservationViewSet, "idempotency_wait_seconds", 0):
+            res = self.reserve()
+            retry = self.reserve()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, res.data)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_replay_keeps_location_header(self):
+        self.performance.queued_booking = True
+        self.performance.save()
+
+        first = self.reserve()
+        retry = self.reserve()
+
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(retry.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(retry["Location"], first["Location"])
+
+    def test_failed_request_releases_key(self):
+        res = self.reserve(seat=99)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        res = self.reserve(seat=1)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_expired_key_is_not_replayed(self):
+        self.reserve(seat=1)
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+
+        res = self.reserve(seat=2)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reservation.objects.count(), 2)
+
+    def test_requests_without_key_are_not_stored(self):
+        self.client.post(RESERVATION_URL, self.payload(), format="json")
+
+        self.assertFalse(IdempotencyKey.objects.exists())
@@ -0,0 +1,148 @@
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from catalog.jobs import (
+    HEARTBEAT_SECONDS,
+    _heartbeat,
+    claim_jobs,
+    enqueue,
+    job_stats,
+    requeue_stale_jobs,
+    run_job,
+)
+from catalog.models import Job
+
+
+class JobQueueTests(TestCase):
+    def test_enqueue_unknown_task(self):
+        with self.assertRaises(ValueError):
+            enqueue("mine_bitcoin")
+
+    def test_claim_due_jobs_once(self):
+        first = enqueue("refresh_schedule")
+        second = enqueue("refresh_sales", full=True)
+        enqueue("refresh_schedule", delay=60)
+
+        self.assertEqual(claim_jobs(5), [first.id, second.id])
+        self.assertEqual(claim_jobs(5), [])
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.attempts), (Job.RUNNING, 1))
+
+    def test_run_job_records_result_and_timing(self):
+        job = enqueue("refresh_sales", full=True)
+        claim_jobs(1)
+
+        job = run_job(job.id)
+
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, 0)
+        self.assertIsNotNone(job.duration)
+        self.assertEqual(job_stats()[0]["task"], "refresh_sales")
+        self.assertEqual(job_stats()[0]["runs"], 1)
+
+    def test_failed_job_is_retried_then_fails(self):
+        job = enqueue("refresh_schedule", max_attempts=2)
+        with mock.patch(
+            "catalog.schedule.refresh_schedule", side_effect=RuntimeError("boom")
+        ):
+            claim_jobs(1)
+            job = run_job(job.id)
+            self.assertEqual(job.status, Job.QUEUED)
+            self.assertGreater(job.run_at, timezone.now())
+            self.assertIn("boom", job.error)
+
+            Job.objects.filter(id=job.id).update(run_at=timezone.now())
+            claim_jobs(1)
+            job = run_job(job.id)
+
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    def test_requeue_stale_jobs(self):
+        job = enqueue("refresh_schedule")
+        claim_jobs(1)
+        Job.objects.filter(id=job.id).update(
+            started_at=timezone.now() - timedelta(hours=2),
+            heartbeat_at=timezone.now() - timedelta(hours=2),
+        )
+
+        self.assertEqual(requeue_stale_jobs(3600), 1)
+        self.assertEqual(claim_jobs(1), [job.id])
+
+    def test_long_job_with_heartbeat_is_not_requeued(self):
+        job = enqueue("refresh_schedule")
+        claim_jobs(1)
+        Job.objects.filter(id=job.id).update(
+            started_at=timezone.now() - timedelta(hours=2)
+        )
+
+        self.assertEqual(requeue_stale_jobs(3600), 0)
+        self.assertEqual(Job.objects.get().status, Job.RUNNING)
+
+    def test_stale_job_out_of_attempts_fails(self):
+        job = enqueue("refresh_schedule", max_attempts=1)
+        claim_jobs(1)
+        Job.objects.filter(id=job.id).update(
+            heartbeat_at=timezone.now() - timedelta(hours=2)
+        )
+
+        self.assertEqual(requeue_stale_jobs(3600), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(claim_jobs(1), [])
+
+    def test_run_worker_drains_queue(self):
+        enqueue("refresh_schedule")
+        enqueue("archive_tickets", days=30)
+        out = StringIO()
+
+        call_command("run_worker", "--once", stdout=out)
+
+        self.assertIn("Job queue drained", out.getvalue())
+        self.assertEqual(
+            set(Job.objects.values_list("status", flat=True)), {Job.SUCCEEDED}
+        )
+
+    def test_run_worker_rejects_stale_after_within_heartbeat(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "run_worker",
+                "--once",
+                "--stale-after",
+                str(HEARTBEAT_SECONDS),
+                stdout=StringIO(),
+            )
+
+
+class JobThreadTests(TransactionTestCase):
+    # Heartbeat and pool threads write on their own connections
+    def test_heartbeat_is_refreshed_while_job_runs(self):
+        job = enqueue("refresh_schedule")
+        claim_jobs(1)
+        Job.objects.filter(id=job.id).update(
+            heartbeat_at=timezone.now() - timedelta(hours=2)
+        )
+
+        with _heartbeat(job.id, interval=0.01):
+            time.sleep(0.1)
+
+        job.refresh_from_db()
+        self.assertGreater(job.heartbeat_at, timezone.now() - timedelta(minutes=1))
+
+    def test_thread_pool_worker_drains_queue(self):
+        for _ in range(3):
+            enqueue("refresh_schedule")
+        out = StringIO()
+
+        call_command("run_worker", "--once", "--concurrency", "2", stdout=out)
+
+        self.assertIn("Job queue drained", out.getvalue())
+        self.assertEqual(
+            list(Job.objects.values_list("status", flat=True)), [Job.SUCCEEDED] * 3
+        )
@@ -0,0 +1,12 @@
+from django.test import TestCase
+from django.urls import reverse
+
+
+class LazySchemaViewTests(TestCase):
+    def test_schema_and_docs_are_served(self):
+        res = self.client.get(reverse("schema"))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(b"openapi:", res.content)
+        for name in ("swagger-ui", "redoc"):
+            self.assertEqual(self.client.get(reverse(name)).status_code, 200)
@@ -0,0 +1,139 @@
+import sys
+from contextlib import contextmanager
+from datetime import timedelta
+from io import StringIO
+
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from catalog.booking_queue import acquire_worker_lock
+from catalog.bookings import get_booking_summary
+from catalog.models import (
+    Actor,
+    BookingRequest,
+    Genre,
+    IdempotencyKey,
+    Job,
+    Performance,
+    Play,
+    PriceTier,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+
+def _called_from_str():
+    frame = sys._getframe()
+    while frame is not None:
+        if frame.f_code.co_name == "__str__":
+            return True
+        frame = frame.f_back
+    return False
+
+
+@contextmanager
+def forbid_queries_in_str():
+    """Fail on any query issued from a __str__ (lazy loading a relation)"""
+
+    def guard(execute, sql, params, many, context):
+        if _called_from_str():
+            raise AssertionError(f"__str__ issued a query: {sql}")
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(guard):
+        yield
+
+
+class ModelStrQueryTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@admin.com", password="test12345"
+        )
+        hall = TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=10)
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        play.genres.add(Genre.objects.create(name="Ballet"))
+        play.actors.add(Actor.objects.create(first_name="Carlotta", last_name="Grisi"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.performance = Performance.objects.create(
+                play=play,
+                theatre_hall=hall,
+                show_time=timezone.now() + timedelta(days=1),
+            )
+            old = Performance.objects.create(
+                play=play,
+                theatre_hall=hall,
+                show_time=timezone.now() - timedelta(days=400),
+            )
+            reservation = Reservation.objects.create(user=self.admin)
+            for performance in (self.performance, old):
+                Ticket.objects.create(
+                    row=1, seat=1, performance=performance, reservation=reservation
+                )
+        call_command("archive_tickets", stdout=StringIO())
+        call_command("refresh_sales_rollups", stdout=StringIO())
+        get_booking_summary(self.admin)
+        IdempotencyKey.objects.create(user=self.admin, key="key", request_hash="")
+        BookingRequest.objects.create(
+            user=self.admin, performance=self.performance, seats=[[2, 2]]
+        )
+        PriceTier.objects.create(performance=self.performance, price="25.00")
+        Job.objects.create(task="refresh_schedule")
+        acquire_worker_lock(self.performance.id, 60)
+
+    def test_str_of_every_model_never_queries(self):
+        with forbid_queries_in_str():
+            for model in apps.get_app_config("catalog").get_models():
+                instances = list(model.objects.all())
+                self.assertTrue(instances, f"seed a {model.__name__} above")
+                for instance in instances:
+                    str(instance)
+
+    def test_str_uses_related_objects_when_loaded(self):
+        ticket = Ticket.objects.select_related("performance").get()
+        self.assertIn("Giselle at Blue", str(ticket))
+
+        ticket = Ticket.objects.get()
+        self.assertIn(f"Performance: #{self.performance.id}", str(ticket))
+
+    def test_performance_label_follows_renames(self):
+        play = self.performance.play
+        play.title = "Coppelia"
+        play.save()
+        hall = self.performance.theatre_hall
+        hall.name = "Red"
+        hall.save()
+
+        self.assertIn(
+            "Coppelia at Red", str(Performance.objects.get(id=self.performance.id))
+        )
+
+    def test_admin_changelists_never_query_from_str(self):
+        self.client.force_login(self.admin)
+
+        with forbid_queries_in_str():
+            for model in admin.site._registry:
+                if model._meta.app_label != "catalog":
+                    continue
+                url = reverse(f"admin:catalog_{model._meta.model_name}_changelist")
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_api_rendering_never_queries_from_str(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        with forbid_queries_in_str():
+            for url in (
+                reverse("catalog:reservation-list"),
+                reverse("catalog:performance-list"),
+                reverse("catalog:performance-detail", args=[self.performance.id]),
+                reverse("catalog:scheduleentry-list"),
+            ):
+                self.assertEqual(client.get(url).status_code, 200)
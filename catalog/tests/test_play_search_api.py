@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.models import Actor, Genre, Play
+from catalog.search import search_play_ids
+
+PLAY_SEARCH_URL = reverse("catalog:play-search")
+
+
+class PlaySearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.giselle = Play.objects.create(
+            title="Giselle", description="A romantic ballet in two acts"
+        )
+        self.hamlet = Play.objects.create(
+            title="Hamlet", description="Tragedy about a ballet-hating prince"
+        )
+        self.carmen = Play.objects.create(title="Carmen", description="Opera")
+
+    def test_search_by_title_prefix(self):
+        self.assertEqual(search_play_ids("gisel"), [self.giselle.id])
+
+    def test_search_ranks_title_above_description(self):
+        Play.objects.create(title="Ballet Gala", description="Evening")
+
+        play_ids = search_play_ids("ballet")
+
+        self.assertEqual(len(play_ids), 3)
+        self.assertEqual(play_ids[0], Play.objects.get(title="Ballet Gala").id)
+
+    def test_search_by_actor_and_genre(self):
+        actor = Actor.objects.create(first_name="Carlotta", last_name="Grisi")
+        genre = Genre.objects.create(name="Opera")
+        self.giselle.actors.add(actor)
+        self.carmen.genres.add(genre)
+
+        self.assertEqual(search_play_ids("grisi"), [self.giselle.id])
+        self.assertEqual(search_play_ids("carlotta gis"), [self.giselle.id])
+
+        actor.last_name = "Zambelli"
+        actor.save()
+        self.assertEqual(search_play_ids("grisi"), [])
+        self.assertEqual(search_play_ids("zamb"), [self.giselle.id])
+
+    def test_search_endpoint(self):
+        res = self.client.get(PLAY_SEARCH_URL, {"q": "hAml"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([play["title"] for play in res.data], ["Hamlet"])
+
+    def test_search_endpoint_empty_query(self):
+        res = self.client.get(PLAY_SEARCH_URL, {"q": "  "})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [])
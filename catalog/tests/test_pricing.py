@@ -0,0 +1,121 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from catalog.models import (
+    Performance,
+    Play,
+    PriceTier,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from catalog.pricing import price_tables
+
+RESERVATION_URL = reverse("catalog:reservation-list")
+
+
+def seat_map_url(performance_id):
+    return reverse("catalog:performance-seat-map", args=[performance_id])
+
+
+class PricingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+        hall = TheatreHall.objects.create(
+            name="Blue", rows=2, seats_in_row=4, layout=["AABB", "CC.."]
+        )
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        self.performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now()
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            for zone, price in (("A", "50.00"), ("B", "30.00")):
+                PriceTier.objects.create(
+                    performance=self.performance, zone=zone, price=price
+                )
+
+    def reserve(self, *seats, performance=None):
+        reservation = Reservation.objects.create(user=self.user)
+        for row, seat in seats:
+            Ticket.objects.create(
+                row=row,
+                seat=seat,
+                performance=performance or self.performance,
+                reservation=reservation,
+            )
+        return reservation
+
+    def test_ticket_prices_and_total(self):
+        self.reserve((1, 1), (1, 3), (2, 1))
+
+        res = self.client.get(RESERVATION_URL)
+
+        reservation = res.data["results"][0]
+        self.assertEqual(
+            [ticket["price"] for ticket in reservation["tickets"]],
+            ["50.00", "30.00", None],
+        )
+        # Not the sum of the priced tickets: that would understate it
+        self.assertIsNone(reservation["total"])
+
+    def test_total_of_priced_tickets(self):
+        self.reserve((1, 1), (1, 3))
+
+        res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(res.data["results"][0]["total"], "80.00")
+
+    def test_price_table_is_cached_and_invalidated(self):
+        self.assertEqual(
+            price_tables([self.performance])[self.performance.id],
+            {"A": Decimal("50.00"), "B": Decimal("30.00")},
+        )
+        with self.assertNumQueries(0):
+            price_tables([self.performance])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PriceTier.objects.filter(zone="B").get().delete()
+
+        self.performance.refresh_from_db()
+        self.assertEqual(
+            price_tables([self.performance])[self.performance.id],
+            {"A": Decimal("50.00")},
+        )
+
+    def test_reservation_list_queries_do_not_grow_with_tickets(self):
+        self.reserve((1, 1))
+        cache.clear()
+        with self.assertNumQueries(7):
+            self.client.get(RESERVATION_URL)
+
+        other = Performance.objects.create(
+            play=self.performance.play,
+            theatre_hall=self.performance.theatre_hall,
+            show_time=timezone.now(),
+        )
+        self.reserve((1, 2), (1, 3), (1, 4))
+        self.reserve((1, 1), (1, 2), (2, 1), performance=other)
+        cache.clear()
+        with self.assertNumQueries(7):
+            res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(
+            [reservation["total"] for reservation in res.data["results"]],
+            [None, "110.00", "50.00"],
+        )
+
+    def test_seat_map_includes_prices(self):
+        res = self.client.get(seat_map_url(self.performance.id))
+
+        self.assertEqual(res.data["prices"], {"A": "50.00", "B": "30.00"})
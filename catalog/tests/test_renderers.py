@@ -0,0 +1,84 @@
+import datetime
+import decimal
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from catalog.models import Performance, Play, TheatreHall
+from catalog.renderers import ORJSONRenderer, stream_json_list
+from catalog.views import PerformanceViewSet
+
+PERFORMANCE_URL = reverse("catalog:performance-list")
+
+
+class ORJSONRendererTests(TestCase):
+    def test_output_matches_json_renderer(self):
+        data = {
+            "show_time": datetime.datetime(
+                2024, 6, 15, 12, 0, 30, 120, tzinfo=datetime.timezone.utc
+            ),
+            "created_at": datetime.datetime(2024, 6, 15, 12, 0),
+            "date": datetime.date(2024, 6, 15),
+            "price": decimal.Decimal("12.50"),
+            "title": "Лебедине озеро\u2028\u2029",
+            "nested": ReturnDict({"id": 1, "genres": ["Ballet"]}, serializer=None),
+            "empty": None,
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_falls_back_to_json_renderer(self):
+        data = {"id": 1}
+
+        self.assertEqual(
+            ORJSONRenderer().render(data, "application/json; indent=4"),
+            JSONRenderer().render(data, "application/json; indent=4"),
+        )
+
+    def test_stream_json_list(self):
+        items = [{"id": index} for index in range(5)]
+
+        self.assertEqual(
+            b"".join(stream_json_list(items, chunk_size=2)),
+            JSONRenderer().render(items),
+        )
+        self.assertEqual(b"".join(stream_json_list([])), b"[]")
+
+
+class StreamingListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test@test.com", password="test12345"
+            )
+        )
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        hall = TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=10)
+        for _ in range(3):
+            Performance.objects.create(
+                play=play, theatre_hall=hall, show_time=timezone.now()
+            )
+
+    def test_large_list_is_streamed(self):
+        expected = self.client.get(PERFORMANCE_URL).data
+
+        with mock.patch.object(PerformanceViewSet, "stream_threshold", 2):
+            res = self.client.get(PERFORMANCE_URL)
+
+        self.assertIsInstance(res, StreamingHttpResponse)
+        self.assertEqual(json.loads(b"".join(res.streaming_content)), expected)
+
+    def test_browsable_api_is_not_streamed(self):
+        with mock.patch.object(PerformanceViewSet, "stream_threshold", 2):
+            res = self.client.get(PERFORMANCE_URL, HTTP_ACCEPT="text/html")
+
+        self.assertNotIsInstance(res, StreamingHttpResponse)
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.models import (
+    Performance,
+    PerformanceSales,
+    Play,
+    Reservation,
+    RollupWatermark,
+    TheatreHall,
+    Ticket,
+)
+
+SALES_URL = reverse("catalog:analytics-sales")
+
+
+class SalesAnalyticsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@admin.com", password="test12345", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+        self.giselle = Play.objects.create(title="Giselle", description="Ballet")
+        hamlet = Play.objects.create(title="Hamlet", description="Tragedy")
+        hall = TheatreHall.objects.create(name="Blue", rows=2, seats_in_row=5)
+        show_time = timezone.now() + timedelta(days=1)
+        self.first = Performance.objects.create(
+            play=self.giselle, theatre_hall=hall, show_time=show_time
+        )
+        self.second = Performance.objects.create(
+            play=hamlet, theatre_hall=hall, show_time=show_time
+        )
+        self.reservation = Reservation.objects.create(user=self.admin)
+        self.sell(self.first, 1, 2, 3)
+
+    def sell(self, performance, *seats):
+        for seat in seats:
+            Ticket.objects.create(
+                row=1, seat=seat, performance=performance, reservation=self.reservation
+            )
+
+    def refresh(self, **options):
+        call_command("refresh_sales_rollups", stdout=StringIO(), **options)
+
+    def test_incremental_refresh_uses_watermark(self):
+        self.refresh()
+        self.assertEqual(PerformanceSales.objects.get(pk=self.first.id).tickets_sold, 3)
+        self.assertEqual(
+            PerformanceSales.objects.get(pk=self.second.id).tickets_sold, 0
+        )
+
+        PerformanceSales.objects.filter(pk=self.first.id).update(tickets_sold=99)
+        self.sell(self.second, 1)
+        self.refresh(rescan=0)
+
+        self.assertEqual(
+            PerformanceSales.objects.get(pk=self.first.id).tickets_sold, 99
+        )
+        self.assertEqual(
+            PerformanceSales.objects.get(pk=self.second.id).tickets_sold, 1
+        )
+        self.assertEqual(
+            RollupWatermark.objects.get().value, Ticket.objects.latest("id").id
+        )
+
+    def test_incremental_refresh_catches_late_commits(self):
+        Ticket.objects.create(
+            id=10, row=2, seat=1, performance=self.first, reservation=self.reservation
+        )
+        self.refresh()
+        self.assertEqual(RollupWatermark.objects.get().value, 10)
+
+        # Inserted before the ticket above, but committed after the refresh
+        Ticket.objects.create(
+            id=5, row=2, seat=1, performance=self.second, reservation=self.reservation
+        )
+        self.refresh()
+
+        self.assertEqual(
+            PerformanceSales.objects.get(pk=self.second.id).tickets_sold, 1
+        )
+        self.assertEqual(RollupWatermark.objects.get().value, 10)
+
+    def test_full_refresh_catches_deleted_tickets(self):
+        self.refresh()
+        Ticket.objects.filter(performance=self.first, seat=1).delete()
+
+        self.refresh(rescan=0)
+        self.assertEqual(PerformanceSales.objects.get(pk=self.first.id).tickets_sold, 3)
+
+        self.refresh(full=True)
+        self.assertEqual(PerformanceSales.objects.get(pk=self.first.id).tickets_sold, 2)
+
+    def test_sales_grouped_by_play(self):
+        self.refresh()
+
+        res = self.client.get(SALES_URL, {"group_by": "play"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["play_title"], "Giselle")
+        self.assertEqual(res.data[0]["tickets_sold"], 3)
+        self.assertEqual(res.data[0]["occupancy"], 0.3)
+        self.assertNotIn("day", res.data[0])
+
+    def test_sales_grouped_by_hall_and_day(self):
+        self.refresh()
+
+        res = self.client.get(
+            SALES_URL, {"group_by": "theatre_hall,day", "from": "2000-01-01"}
+        )
+
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(res.data[0]["theatre_hall_name"], "Blue")
+        self.assertEqual(res.data[0]["performances"], 2)
+        self.assertEqual(res.data[0]["capacity"], 20)
+
+    def test_invalid_grouping(self):
+        res = self.client.get(SALES_URL, {"group_by": "genre"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_date_is_reported_by_parameter_name(self):
+        res = self.client.get(SALES_URL, {"to": "31.12.2024"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(res.data), ["to"])
+
+    def test_sales_forbidden_for_non_admin(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(SALES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
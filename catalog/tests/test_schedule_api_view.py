@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from catalog.models import (
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    ScheduleEntry,
+    TheatreHall,
+    Ticket,
+)
+from catalog.schedule import refresh_schedule
+
+SCHEDULE_URL = reverse("catalog:scheduleentry-list")
+
+
+class ScheduleApiTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("test@test.com", "password123")
+        self.client.force_authenticate(self.user)
+        self.hall = TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=10)
+        self.play = Play.objects.create(title="Giselle", description="Ballet")
+        self.genre = Genre.objects.create(name="Ballet")
+
+    def create_performance(self, days):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Performance.objects.create(
+                play=self.play,
+                theatre_hall=self.hall,
+                show_time=timezone.now() + timedelta(days=days),
+            )
+
+    def test_performance_creates_schedule_entry(self):
+        performance = self.create_performance(days=1)
+
+        entry = ScheduleEntry.objects.get(performance=performance)
+        self.assertEqual(entry.play_title, "Giselle")
+        self.assertEqual(entry.theatre_hall_name, "Blue")
+        self.assertEqual(entry.tickets_available, 100)
+
+    def test_schedule_follows_tickets_genres_and_titles(self):
+        performance = self.create_performance(days=1)
+        reservation = Reservation.objects.create(user=self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                row=1, seat=1, performance=performance, reservation=reservation
+            )
+            self.play.genres.add(self.genre)
+            self.play.title = "Giselle II"
+            self.play.save()
+
+        entry = ScheduleEntry.objects.get(performance=performance)
+        self.assertEqual(entry.tickets_available, 99)
+        self.assertEqual(entry.genres, ["Ballet"])
+        self.assertEqual(entry.play_title, "Giselle II")
+
+    def test_list_schedule_filtered_by_dates(self):
+        tomorrow = self.create_performance(days=1)
+        next_week = self.create_performance(days=7)
+
+        res = self.client.get(SCHEDULE_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in res.data], [tomorrow.id, next_week.id])
+
+        res = self.client.get(SCHEDULE_URL, {"from": str(next_week.show_time.date())})
+        self.assertEqual([item["id"] for item in res.data], [next_week.id])
+
+        res = self.client.get(SCHEDULE_URL, {"to": str(tomorrow.show_time.date())})
+        self.assertEqual([item["id"] for item in res.data], [tomorrow.id])
+
+    def test_list_schedule_invalid_date(self):
+        res = self.client.get(SCHEDULE_URL, {"from": "garbage"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("from", res.data)
+
+    def test_past_performances_are_not_scheduled(self):
+        performance = self.create_performance(days=-1)
+        refresh_schedule()
+
+        self.assertFalse(ScheduleEntry.objects.filter(performance=performance).exists())
@@ -0,0 +1,53 @@
+import gzip
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+SCHEMA_URL = reverse("schema")
+
+
+class CachedSchemaTests(TestCase):
+    def setUp(self):
+        self.schema_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.schema_dir.cleanup)
+        settings_override = override_settings(
+            OPENAPI_SCHEMA_DIR=Path(self.schema_dir.name)
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_etag_revalidation(self):
+        res = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(b"openapi:", res.content)
+        res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b"")
+
+    def test_gzip_and_json(self):
+        plain = self.client.get(SCHEMA_URL, {"format": "json"})
+        gzipped = self.client.get(
+            SCHEMA_URL, {"format": "json"}, HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+
+        self.assertEqual(plain["Content-Type"], "application/vnd.oai.openapi+json")
+        self.assertEqual(gzipped["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(gzipped.content), plain.content)
+        self.assertNotEqual(gzipped["ETag"], plain["ETag"])
+
+    def test_serves_built_file_until_rebuilt(self):
+        call_command("build_openapi_schema", stdout=StringIO())
+        path = Path(self.schema_dir.name) / "openapi.yaml"
+        self.assertTrue(Path(f"{path}.gz").exists())
+        self.assertEqual(self.client.get(SCHEMA_URL).content, path.read_bytes())
+
+        path.write_bytes(b"openapi: 3.0.3\n")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 10**9))
+
+        self.assertEqual(self.client.get(SCHEMA_URL).content, b"openapi: 3.0.3\n")
@@ -0,0 +1,119 @@
+from unittest import mock
+
+import orjson
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.models import Performance, Play, Reservation, TheatreHall, Ticket
+from catalog.seat_events import RESYNC, LocalSeatEventBackend
+from catalog.views import PerformanceViewSet
+
+RESERVATION_URL = reverse("catalog:reservation-list")
+
+
+def seats_url(performance_id):
+    return reverse("catalog:performance-seats", args=[performance_id])
+
+
+def parse_event(chunk):
+    fields = dict(
+        line.split(": ", 1) for line in chunk.decode().splitlines() if ": " in line
+    )
+    return fields["event"], orjson.loads(fields["data"])
+
+
+@mock.patch.object(PerformanceViewSet, "seat_stream_seconds", 0.5)
+@mock.patch.object(PerformanceViewSet, "seat_stream_keepalive_seconds", 0.1)
+class SeatEventStreamTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+
+        hall = TheatreHall.objects.create(name="Blue", rows=5, seats_in_row=8)
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        self.performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now()
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ticket = Ticket.objects.create(
+                row=1,
+                seat=1,
+                performance=self.performance,
+                reservation=Reservation.objects.create(user=self.user),
+            )
+
+    def test_stream_starts_with_snapshot(self):
+        res = self.client.get(seats_url(self.performance.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/event-stream")
+        event, data = parse_event(next(iter(res.streaming_content)))
+        self.assertEqual(event, "snapshot")
+        self.assertEqual(data["taken"], [[1, 1]])
+        self.assertEqual(data["available"], {"A": 39})
+        res.close()
+
+    def test_stream_releases_database_connection_after_snapshot(self):
+        res = self.client.get(seats_url(self.performance.id))
+
+        # Outside the test case's transaction, as in a real request
+        with mock.patch.object(connection, "in_atomic_block", False), mock.patch.object(
+            connection, "close"
+        ) as close:
+            next(iter(res.streaming_content))
+        close.assert_called_once()
+        res.close()
+
+    def test_reservation_is_pushed_as_one_delta(self):
+        res = self.client.get(seats_url(self.performance.id))
+        stream = iter(res.streaming_content)
+        next(stream)
+
+        payload = {
+            "tickets": [
+                {"row": 2, "seat": seat, "performance": self.performance.id}
+                for seat in (3, 4)
+            ]
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(RESERVATION_URL, payload, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ticket.delete()
+
+        events = [parse_event(chunk) for chunk in stream if b"event:" in chunk]
+        self.assertEqual(
+            events,
+            [
+                ("seats", {"taken": [[2, 3], [2, 4]], "released": []}),
+                ("seats", {"taken": [], "released": [[1, 1]]}),
+            ],
+        )
+
+    def test_unknown_performance(self):
+        res = self.client.get(seats_url(0))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class LocalSeatEventBackendTests(TestCase):
+    def test_overflow_asks_subscriber_to_resync(self):
+        backend = LocalSeatEventBackend()
+        backend.max_queue_size = 2
+
+        with backend.subscribe(1) as subscriber:
+            for seat in range(3):
+                backend.publish(1, {"taken": [[1, seat]], "released": []})
+            backend.publish(2, {"taken": [[1, 1]], "released": []})
+
+            self.assertIs(subscriber.get_nowait(), RESYNC)
+            self.assertTrue(subscriber.empty())
+
+        self.assertEqual(dict(backend._subscribers), {})
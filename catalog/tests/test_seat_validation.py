@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.models import Performance, Play, Reservation, TheatreHall, Ticket
+from catalog.serializers import ReservationSerializer
+
+RESERVATION_URL = reverse("catalog:reservation-list")
+
+
+class SeatBatchValidationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        hall = TheatreHall.objects.create(name="Blue", rows=20, seats_in_row=20)
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        self.performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now()
+        )
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+
+    def test_errors_per_seat(self):
+        errors = Ticket.validate_seats(
+            [
+                (self.performance, 2, 2),
+                (self.performance, 21, 2),
+                (self.performance, 2, 2),
+                (self.performance, 1, 1),
+            ]
+        )
+
+        self.assertEqual(errors[0], {})
+        self.assertEqual(list(errors[1]), ["row"])
+        self.assertEqual(errors[2], {"seat": ["This seat is requested twice."]})
+        self.assertEqual(errors[3], {"seat": ["This seat is already taken."]})
+
+    def test_validation_queries_do_not_grow_with_seats(self):
+        payload = {
+            "tickets": [
+                {"row": row, "seat": seat, "performance": self.performance.id}
+                for row in range(2, 12)
+                for seat in range(1, 21)
+            ]
+        }
+        serializer = ReservationSerializer(data=payload)
+
+        # performances, then taken seats of each performance
+        with self.assertNumQueries(2):
+            self.assertTrue(serializer.is_valid())
+
+    def test_api_returns_structured_errors(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        payload = {
+            "tickets": [
+                {"row": 3, "seat": 3, "performance": self.performance.id},
+                {"row": 1, "seat": 1, "performance": self.performance.id},
+            ]
+        }
+
+        res = client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["tickets"][0], {})
+        self.assertEqual(
+            res.data["tickets"][1], {"seat": ["This seat is already taken."]}
+        )
+
+    def test_unknown_performance(self):
+        serializer = ReservationSerializer(
+            data={"tickets": [{"row": 1, "seat": 2, "performance": 0}]}
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("performance", serializer.errors["tickets"][0])
@@ -0,0 +1,138 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+PERFORMANCE_URL = reverse("catalog:performance-list")
+
+
+def performance_detail_url(performance_id):
+    return reverse("catalog:performance-detail", args=[performance_id])
+
+
+def play_detail_url(play_id):
+    return reverse("catalog:play-detail", args=[play_id])
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+        self.hall = TheatreHall.objects.create(name="Blue", rows=10, seats_in_row=10)
+        self.play = Play.objects.create(title="Giselle", description="Ballet")
+        self.play.genres.add(Genre.objects.create(name="Ballet"))
+        self.play.actors.add(
+            Actor.objects.create(first_name="Carlotta", last_name="Grisi")
+        )
+        self.performance = Performance.objects.create(
+            play=self.play, theatre_hall=self.hall, show_time=timezone.now()
+        )
+        Ticket.objects.create(
+            row=1,
+            seat=2,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+
+    def test_detail_fields_prune_queries(self):
+        url = performance_detail_url(self.performance.id)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(url, {"fields": "id,theatre_hall"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            {
+                "id": self.performance.id,
+                "theatre_hall": {
+                    "id": self.hall.id,
+                    "name": "Blue",
+                    "rows": 10,
+                    "seats_in_row": 10,
+                    "capacity": 100,
+                    "layout": None,
+                },
+            },
+        )
+
+    def test_detail_taken_place_only(self):
+        url = performance_detail_url(self.performance.id)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(url, {"fields": "taken_place"})
+
+        self.assertEqual(res.data, {"taken_place": [{"seat": 2, "row": 1}]})
+
+    def test_detail_unexpanded_relations_are_ids(self):
+        url = performance_detail_url(self.performance.id)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(url, {"fields": "id,play,theatre_hall", "expand": ""})
+
+        self.assertEqual(
+            res.data,
+            {
+                "id": self.performance.id,
+                "play": self.play.id,
+                "theatre_hall": self.hall.id,
+            },
+        )
+
+    def test_detail_default_output_is_unchanged(self):
+        res = self.client.get(performance_detail_url(self.performance.id))
+
+        self.assertEqual(list(res.data), ["id", "play", "theatre_hall", "taken_place"])
+        self.assertEqual(res.data["play"]["genres"], ["Ballet"])
+        self.assertEqual(res.data["play"]["actors"], ["Carlotta Grisi"])
+
+    def test_list_without_availability_skips_ticket_count(self):
+        with self.assertNumQueries(1) as context:
+            res = self.client.get(PERFORMANCE_URL, {"fields": "id,play_title"})
+
+        self.assertEqual(
+            res.data, [{"id": self.performance.id, "play_title": "Giselle"}]
+        )
+        self.assertNotIn("catalog_ticket", context.captured_queries[0]["sql"])
+
+    def test_play_detail_relations_as_ids(self):
+        res = self.client.get(
+            play_detail_url(self.play.id), {"fields": "title,genres", "expand": ""}
+        )
+
+        self.assertEqual(
+            res.data,
+            {
+                "title": "Giselle",
+                "genres": list(self.play.genres.values_list("id", flat=True)),
+            },
+        )
+
+    def test_fields_are_ignored_on_write(self):
+        payload = {
+            "play": self.play.id,
+            "theatre_hall": self.hall.id,
+            "show_time": "2024-06-16 14:00:00+00:00",
+        }
+        user = get_user_model().objects.create_superuser("admin@test.com", "pass")
+        self.client.force_authenticate(user)
+
+        res = self.client.post(f"{PERFORMANCE_URL}?fields=id", payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["play"], self.play.id)
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from catalog.models import Performance, Play, Reservation, TheatreHall, Ticket
+
+RESERVATION_URL = reverse("catalog:reservation-list")
+
+
+class TicketSaveTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+
+        hall = TheatreHall.objects.create(name="Blue", rows=5, seats_in_row=5)
+        play = Play.objects.create(title="Giselle", description="Ballet")
+        self.performance = Performance.objects.create(
+            play=play, theatre_hall=hall, show_time=timezone.now()
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+
+    def test_raw_save_still_validates(self):
+        ticket = Ticket(
+            row=6, seat=1, performance=self.performance, reservation=self.reservation
+        )
+
+        with self.assertRaises(ValidationError):
+            ticket.save()
+
+    def test_validated_save_skips_full_clean(self):
+        ticket = Ticket(
+            row=1, seat=1, performance=self.performance, reservation=self.reservation
+        )
+
+        with mock.patch.object(Ticket, "full_clean") as full_clean:
+            ticket.save(validated=True)
+
+        full_clean.assert_not_called()
+        self.assertIsNotNone(ticket.id)
+
+    def test_reservation_validates_tickets_once(self):
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": seat, "performance": self.performance.id}
+                for seat in (1, 2, 3)
+            ]
+        }
+
+        with mock.patch.object(Ticket, "full_clean") as full_clean:
+            res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        full_clean.assert_not_called()
+        self.assertEqual(Ticket.objects.count(), 3)
+
+    def test_reservation_with_duplicate_seat(self):
+        ticket = {"row": 1, "seat": 1, "performance": self.performance.id}
+
+        res = self.client.post(
+            RESERVATION_URL, {"tickets": [ticket, ticket]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
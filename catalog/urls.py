@@ -2,12 +2,16 @@ from django.urls import path, include
 from rest_framework import routers
 
 from catalog.views import (
+    BatchView,
+    BookingRequestViewSet,
+    SalesAnalyticsView,
     GenreViewSet,
     ActorViewSet,
     TheatreHallViewSet,
     PlayViewSet,
     PerformanceViewSet,
     ReservationViewSet,
+    ScheduleViewSet,
 )
 
 app_name = "catalog"
@@ -19,4 +23,10 @@ router.register("theatre_hall", TheatreHallViewSet),
 router.register("play", PlayViewSet)
 router.register("performance", PerformanceViewSet),
 router.register("reservations", ReservationViewSet)
-urlpatterns = [path("", include(router.urls))]
+router.register("schedule", ScheduleViewSet)
+router.register("booking-requests", BookingRequestViewSet)
+urlpatterns = [
+    path("", include(router.urls)),
+    path("batch/", BatchView.as_view(), name="batch"),
+    path("analytics/sales/", SalesAnalyticsView.as_view(), name="analytics-sales"),
+]
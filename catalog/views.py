@@ -1,38 +1,163 @@
-from django.db.models import F, Count
+import time
+from itertools import chain, islice
+
+from django.db.models import F, Count, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import OpenApiParameter, extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser, IsAuthenticated
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.pagination import PageNumberPagination
 
-from catalog.models import Genre, Actor, TheatreHall, Play, Performance, Reservation
+from catalog.analytics import sales_report
+from catalog.booking_queue import enqueue_booking
+from catalog.bookings import get_booking_summary
+from catalog.db_router import ReplicaReadMixin, pin_to_primary
+from catalog.idempotency import IdempotentCreateMixin
+from catalog.models import (
+    BookingRequest,
+    Genre,
+    Actor,
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    ScheduleEntry,
+    Ticket,
+)
 from catalog.permissions import IsAdminOrIfAuthenticatedReadOnly
+from catalog.renderers import EventStreamRenderer, ORJSONRenderer, stream_json_list
+from catalog.search import search_actor_ids, search_play_ids
+from catalog.seat_events import seat_map, stream_seat_events
 from catalog.serializers import (
+    BatchSerializer,
+    BookingRequestSerializer,
+    BookingSummarySerializer,
+    DateRangeQuerySerializer,
     GenreSerializer,
     ActorSerializer,
     TheatreHallSerializer,
     PlaySerializer,
     PlayListSerializer,
+    PlayListCompiledSerializer,
     PlayDetailSerializer,
     PlayImageSerializer,
     PerformanceSerializer,
     PerformanceListSerializer,
+    PerformanceListCompiledSerializer,
     PerformanceDetailSerializer,
     ReservationSerializer,
     ReservationListSerializer,
+    SalesReportQuerySerializer,
+    SalesReportSerializer,
+    ScheduleEntrySerializer,
 )
 
+TICKETS_AVAILABLE = F("theatre_hall__seat_count") - Count("tickets")
+
+
+# Pass ?fields= and ?expand= of safe requests to the serializer context, and
+# let get_queryset() skip the relations and columns nobody asked for.
+class SparseFieldsViewMixin:
+    def _query_names(self, param):
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        value = request.query_params.get(param)
+        if value is None:
+            return None
+        return {name.strip() for name in value.split(",") if name.strip()}
+
+    def wants(self, field):
+        fields = self._query_names("fields")
+        return fields is None or field in fields
+
+    def expands(self, field):
+        expand = self._query_names("expand")
+        return self.wants(field) and (expand is None or field in expand)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self._query_names("fields")
+        context["expand"] = self._query_names("expand")
+        return context
+
+
+# Let list actions fetch many objects at once with ?ids=1,2,3
+class BatchIdsMixin:
+    max_batch_size = 100
+
+    @staticmethod
+    def _params_to_ints(query_string):
+        return [int(str_id) for str_id in query_string.split(",")]
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        ids = self.request.query_params.get("ids")
+        if self.action != "list" or not ids:
+            return queryset
+
+        try:
+            ids = self._params_to_ints(ids)
+        except ValueError:
+            raise ValidationError({"ids": "ids must be comma-separated integers"})
+        if len(ids) > self.max_batch_size:
+            raise ValidationError(
+                {"ids": f"At most {self.max_batch_size} ids per request"}
+            )
+        return queryset.filter(id__in=ids)
 
-class GenreViewSet(GenericViewSet, mixins.ListModelMixin, mixins.CreateModelMixin):
+
+# Serve unpaginated lists through a compiled (values-based) serializer,
+# streamed as JSON once they grow past stream_threshold items.
+class CompiledListMixin:
+    compiled_list_serializer_class = None
+    stream_threshold = 500
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.compiled_list_serializer_class(
+            queryset, many=True, context=self.get_serializer_context()
+        )
+        if not isinstance(request.accepted_renderer, ORJSONRenderer):
+            return Response(serializer.data)
+
+        items = serializer.iter_representation(queryset)
+        head = list(islice(items, self.stream_threshold + 1))
+        if len(head) <= self.stream_threshold:
+            return Response(head)
+
+        return StreamingHttpResponse(
+            stream_json_list(chain(head, items)),
+            content_type=request.accepted_renderer.media_type,
+        )
+
+
+class GenreViewSet(
+    ReplicaReadMixin,
+    SparseFieldsViewMixin,
+    GenericViewSet,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
 
 class ActorViewSet(
+    ReplicaReadMixin,
+    SparseFieldsViewMixin,
     GenericViewSet,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -41,9 +166,49 @@ class ActorViewSet(
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    max_lookup_limit = 50
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "q",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Typeahead by full name, returns the best matches "
+                    "(ex. ?q=carl gri)"
+                ),
+            ),
+            OpenApiParameter(
+                "limit",
+                type=OpenApiTypes.INT,
+                description="Number of matches for ?q= (ex. ?limit=10)",
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get("q")
+        if query is None:
+            return super().list(request, *args, **kwargs)
+
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            raise ValidationError({"limit": "Must be a positive number."})
+        limit = min(limit, self.max_lookup_limit)
+        actor_ids = search_actor_ids(query, limit)
+        actors = Actor.objects.in_bulk(actor_ids)
+        serializer = self.get_serializer(
+            [actors[actor_id] for actor_id in actor_ids if actor_id in actors],
+            many=True,
+        )
+        return Response(serializer.data)
 
 
 class TheatreHallViewSet(
+    ReplicaReadMixin,
+    SparseFieldsViewMixin,
     GenericViewSet,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -55,6 +220,10 @@ class TheatreHallViewSet(
 
 
 class PlayViewSet(
+    ReplicaReadMixin,
+    SparseFieldsViewMixin,
+    BatchIdsMixin,
+    CompiledListMixin,
     GenericViewSet,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -62,12 +231,9 @@ class PlayViewSet(
 ):
     queryset = Play.objects.all()
     serializer_class = PlaySerializer
+    compiled_list_serializer_class = PlayListCompiledSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
-    @staticmethod
-    def _params_to_ints(query_string):
-        return [int(str_id) for str_id in query_string.split(",")]
-
     def get_queryset(self):
         title = self.request.query_params.get("title")
         genres = self.request.query_params.get("genres")
@@ -86,6 +252,18 @@ class PlayViewSet(
             actors_ids = self._params_to_ints(actors)
             queryset = queryset.filter(actors__id__in=actors_ids)
 
+        if self.action == "retrieve":
+            queryset = queryset.only(
+                "id",
+                *[
+                    column
+                    for column in ("title", "description", "image")
+                    if self.wants(column)
+                ],
+            ).prefetch_related(
+                *[relation for relation in ("genres", "actors") if self.wants(relation)]
+            )
+
         return queryset.distinct()
 
     def get_serializer_class(self):
@@ -112,6 +290,34 @@ class PlayViewSet(
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "q",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Words to find in title, description, actors or genres, "
+                    "prefixes allowed (ex. ?q=shakesp hamlet)"
+                ),
+            ),
+        ],
+        responses=PlayListSerializer(many=True),
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="search",
+    )
+    def search(self, request):
+        play_ids = search_play_ids(request.query_params.get("q", ""))
+        plays = Play.objects.prefetch_related("actors", "genres").in_bulk(play_ids)
+        serializer = PlayListSerializer(
+            [plays[play_id] for play_id in play_ids if play_id in plays],
+            many=True,
+            context=self.get_serializer_context(),
+        )
+        return Response(serializer.data)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -132,20 +338,66 @@ class PlayViewSet(
         return super().list(request, *args, **kwargs)
 
 
-class PerformanceViewSet(viewsets.ModelViewSet):
+class PerformanceViewSet(
+    ReplicaReadMixin,
+    SparseFieldsViewMixin,
+    BatchIdsMixin,
+    CompiledListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = (
         Performance.objects.all()
         .select_related("play", "theatre_hall")
-        .annotate(
-            tickets_available=(
-                F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
-                - Count("tickets")
-            )
-        )
+        .annotate(tickets_available=TICKETS_AVAILABLE)
     )
     serializer_class = PerformanceSerializer
+    compiled_list_serializer_class = PerformanceListCompiledSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
+    # Every open seat stream occupies a WSGI worker thread (though no
+    # database connection) for up to seat_stream_seconds: deployments need
+    # one thread per concurrent viewer on top of those serving regular
+    # requests, e.g. gunicorn --workers 4 --threads 64 for ~200 viewers.
+    seat_stream_seconds = 300
+    seat_stream_keepalive_seconds = 15
+
+    def get_queryset(self):
+        if self.action == "list" and not self.wants("tickets_available"):
+            return Performance.objects.select_related("play", "theatre_hall")
+        if self.action in ("seats", "seat_map"):
+            return Performance.objects.select_related("theatre_hall")
+        if self.action == "retrieve":
+            return self._get_detail_queryset()
+        return self.queryset
+
+    def _get_detail_queryset(self):
+        queryset = Performance.objects.all()
+        columns = ["id"]
+        for relation, related_columns in (
+            ("play", ("title", "image")),
+            ("theatre_hall", ("name", "rows", "seats_in_row", "layout")),
+        ):
+            if self.expands(relation):
+                queryset = queryset.select_related(relation)
+                columns += [relation] + [
+                    f"{relation}__{column}" for column in related_columns
+                ]
+            elif self.wants(relation):
+                columns.append(relation)
+
+        if self.expands("play"):
+            queryset = queryset.prefetch_related("play__genres", "play__actors")
+
+        if self.wants("taken_place"):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "tickets",
+                    queryset=Ticket.objects.only("id", "performance", "row", "seat"),
+                )
+            )
+
+        return queryset.only(*columns)
+
     def get_serializer_class(self):
         if self.action == "list":
             return PerformanceListSerializer
@@ -153,6 +405,142 @@ class PerformanceViewSet(viewsets.ModelViewSet):
             return PerformanceDetailSerializer
         return PerformanceSerializer
 
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    @action(methods=["GET"], detail=True, url_path="seat-map")
+    def seat_map(self, request, pk=None):
+        """Hall layout (zone id per seat, "." for gaps), taken and free seats"""
+        return Response(seat_map(self.get_object()))
+
+    @extend_schema(
+        responses={(200, "text/event-stream"): OpenApiTypes.STR},
+        description=(
+            "Server-sent events: a `snapshot` of taken seats, then `seats` "
+            "events with the taken/released seats of each booking."
+        ),
+    )
+    @action(
+        methods=["GET"],
+        detail=True,
+        renderer_classes=[EventStreamRenderer, ORJSONRenderer],
+    )
+    def seats(self, request, pk=None):
+        """Live seat availability, replacing polling of the detail endpoint"""
+        response = StreamingHttpResponse(
+            stream_seat_events(
+                self.get_object(),
+                max_seconds=self.seat_stream_seconds,
+                keepalive_seconds=self.seat_stream_keepalive_seconds,
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class BatchView(APIView):
+    """
+    Resolve many performances and plays in one request, one query per
+    relation, e.g. {"performance": [1, 2], "play": [3]}.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    resources = {"performance": PerformanceViewSet, "play": PlayViewSet}
+
+    @extend_schema(request=BatchSerializer, responses=BatchSerializer)
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = {}
+        for name, ids in serializer.validated_data.items():
+            viewset = self.resources[name](
+                request=request, format_kwarg=None, action="list", args=(), kwargs={}
+            )
+            queryset = viewset.get_queryset().filter(id__in=ids)
+            result[name] = viewset.compiled_list_serializer_class(
+                queryset, many=True, context=viewset.get_serializer_context()
+            ).data
+        return Response(result)
+
+
+class SalesAnalyticsView(ReplicaReadMixin, APIView):
+    """
+    Tickets sold and occupancy from the daily sales rollup, grouped by
+    ?group_by=performance,play,theatre_hall,day (any combination).
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "group_by",
+                type=OpenApiTypes.STR,
+                description="Comma separated groupings (ex. ?group_by=play,day)",
+            ),
+            OpenApiParameter(
+                "from",
+                type=OpenApiTypes.DATE,
+                description="First performance day (ex. ?from=2024-06-01)",
+            ),
+            OpenApiParameter(
+                "to",
+                type=OpenApiTypes.DATE,
+                description="Last performance day (ex. ?to=2024-06-30)",
+            ),
+        ],
+        responses=SalesReportSerializer(many=True),
+    )
+    def get(self, request):
+        query = SalesReportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        rows = sales_report(**query.validated_data)
+        return Response(SalesReportSerializer(rows, many=True).data)
+
+
+class ScheduleViewSet(
+    ReplicaReadMixin, SparseFieldsViewMixin, GenericViewSet, mixins.ListModelMixin
+):
+    """Upcoming performances served from the precomputed schedule table"""
+
+    queryset = ScheduleEntry.objects.all()
+    serializer_class = ScheduleEntrySerializer
+    permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+
+    def get_queryset(self):
+        query = DateRangeQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        date_from = query.validated_data.get("date_from")
+        date_to = query.validated_data.get("date_to")
+
+        queryset = self.queryset.filter(show_time__gte=timezone.now())
+
+        if date_from:
+            queryset = queryset.filter(show_time__date__gte=date_from)
+
+        if date_to:
+            queryset = queryset.filter(show_time__date__lte=date_to)
+
+        return queryset
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from",
+                type=OpenApiTypes.DATE,
+                description="First day of the schedule (ex. ?from=2024-06-15)",
+            ),
+            OpenApiParameter(
+                "to",
+                type=OpenApiTypes.DATE,
+                description="Last day of the schedule (ex. ?to=2024-06-22)",
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 class ReservationSetPagination(PageNumberPagination):
     page_size = 3
@@ -160,7 +548,41 @@ class ReservationSetPagination(PageNumberPagination):
     max_page_size = 20
 
 
+# Hand reservations of queued-booking performances to the booking queue and
+# answer 202 with the request to poll, instead of booking directly.
+class QueuedBookingMixin:
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        performance = serializer.queued_performance
+        if performance is None:
+            self.perform_create(serializer)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        booking = enqueue_booking(
+            request.user, performance, serializer.validated_data["tickets"]
+        )
+        pin_to_primary(request.user)
+        return Response(
+            BookingRequestSerializer(booking).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={
+                "Location": reverse(
+                    "catalog:bookingrequest-detail", args=[booking.id], request=request
+                )
+            },
+        )
+
+
+@extend_schema_view(
+    create=extend_schema(
+        responses={201: ReservationSerializer, 202: BookingRequestSerializer}
+    )
+)
 class ReservationViewSet(
+    IdempotentCreateMixin,
+    QueuedBookingMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     GenericViewSet,
@@ -173,13 +595,92 @@ class ReservationViewSet(
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
-        return Reservation.objects.filter(user=self.request.user)
+        return Reservation.objects.filter(user=self.request.user).prefetch_related(
+            "tickets__performance__theatre_hall",
+            "archived_tickets__performance__theatre_hall",
+        )
 
     def get_serializer_class(self):
-        if self.action == "list":
+        if self.action in ("list", "upcoming", "past"):
             return ReservationListSerializer
+        if self.action == "summary":
+            return BookingSummarySerializer
 
         return ReservationSerializer
 
+    def _paginated_response(self, queryset):
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=["GET"], detail=False)
+    def upcoming(self, request):
+        """Reservations with at least one ticket for a future performance"""
+        return self._paginated_response(
+            self.get_queryset()
+            .filter(tickets__performance__show_time__gte=timezone.now())
+            .distinct()
+        )
+
+    @action(methods=["GET"], detail=False)
+    def past(self, request):
+        """Reservations whose performances are all over"""
+        upcoming = Reservation.objects.filter(
+            user=request.user, tickets__performance__show_time__gte=timezone.now()
+        )
+        return self._paginated_response(
+            self.get_queryset().exclude(id__in=upcoming.values("id"))
+        )
+
+    @action(methods=["GET"], detail=False, pagination_class=None)
+    def summary(self, request):
+        """Booking totals and next performance, served from the rollup"""
+        serializer = self.get_serializer(get_booking_summary(request.user))
+        return Response(serializer.data)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+        pin_to_primary(self.request.user)
+
+
+class BookingRequestViewSet(mixins.RetrieveModelMixin, GenericViewSet):
+    """
+    Status of a queued reservation; ?wait=<seconds> long-polls until the
+    queue worker has processed it.
+    """
+
+    queryset = BookingRequest.objects.all()
+    serializer_class = BookingRequestSerializer
+    permission_classes = (IsAuthenticated,)
+    max_wait_seconds = 20
+    poll_interval = 0.2
+    max_poll_interval = 1.0
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "wait",
+                type=OpenApiTypes.INT,
+                description="Seconds to wait for a pending request (ex. ?wait=10)",
+            )
+        ]
+    )
+    def retrieve(self, request, *args, **kwargs):
+        booking = self.get_object()
+        try:
+            wait = min(int(request.query_params.get("wait", 0)), self.max_wait_seconds)
+        except ValueError:
+            raise ValidationError({"wait": "Must be a number of seconds."})
+
+        deadline = time.monotonic() + wait
+        interval = self.poll_interval
+        while booking.status == BookingRequest.PENDING and time.monotonic() < deadline:
+            time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+            booking.refresh_from_db()
+            # Most requests are processed within the first polls, back off
+            # for the ones waiting behind a long queue
+            interval = min(interval * 2, self.max_poll_interval)
+        return Response(self.get_serializer(booking).data)
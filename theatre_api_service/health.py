@@ -0,0 +1,118 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.utils import OperationalError
+from django.http import JsonResponse
+
+HEALTH_CACHE_KEY = "health:probe"
+
+_lock = threading.Lock()
+_last_report = (0.0, None)
+_migrated = False
+
+
+def probe_database(alias=DEFAULT_DB_ALIAS):
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def database_ready():
+    try:
+        probe_database()
+        return True
+    except OperationalError:
+        # Drop the failed connection so the next probe reconnects
+        connections[DEFAULT_DB_ALIAS].close()
+        return False
+
+
+def wait_until(check, timeout=30.0, first_delay=0.05, max_delay=2.0, on_retry=None):
+    """
+    Call `check` until it returns True, retrying after 50ms and doubling
+    the delay up to `max_delay`. Returns the number of attempts, or None
+    once `timeout` seconds have passed.
+    """
+    deadline = time.monotonic() + timeout
+    delay = first_delay
+    attempt = 0
+    while True:
+        attempt += 1
+        if check():
+            return attempt
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        if on_retry is not None:
+            on_retry(attempt, min(delay, remaining))
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+def pending_migrations(alias=DEFAULT_DB_ALIAS):
+    """Names of the migrations not applied to the database yet"""
+    executor = MigrationExecutor(connections[alias])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [f"{migration.app_label}.{migration.name}" for migration, _ in plan]
+
+
+def _check_cache():
+    cache.set(HEALTH_CACHE_KEY, True, 10)
+    return cache.get(HEALTH_CACHE_KEY) is True
+
+
+def _run_checks():
+    global _migrated
+    checks = {"database": "ok" if database_ready() else "unavailable"}
+
+    try:
+        checks["cache"] = "ok" if _check_cache() else "unavailable"
+    except Exception as error:
+        checks["cache"] = f"unavailable: {error}"
+
+    # New migrations only arrive with a deploy, i.e. a new process: once
+    # applied, the migration graph isn't loaded again.
+    if not _migrated and checks["database"] == "ok":
+        pending = pending_migrations()
+        _migrated = not pending
+    checks["migrations"] = "ok" if _migrated else "pending"
+    return checks
+
+
+def _stale(report):
+    checked_at, checks = report
+    return (
+        checks is None
+        or time.monotonic() - checked_at >= settings.HEALTH_CHECK_CACHE_SECONDS
+    )
+
+
+def readiness():
+    """
+    (ready, checks) of this process, reusing the last result for
+    HEALTH_CHECK_CACHE_SECONDS so frequent probes stay cheap.
+    """
+    global _last_report
+    if _stale(_last_report):
+        with _lock:
+            if _stale(_last_report):
+                _last_report = (time.monotonic(), _run_checks())
+    checks = _last_report[1]
+    return all(status == "ok" for status in checks.values()), checks
+
+
+def live(request):
+    """The process is up and serving requests"""
+    return JsonResponse({"status": "ok"})
+
+
+def ready(request):
+    """Database, cache and migrations are ready: route traffic here"""
+    is_ready, checks = readiness()
+    return JsonResponse(
+        {"status": "ok" if is_ready else "unavailable", "checks": checks},
+        status=200 if is_ready else 503,
+    )
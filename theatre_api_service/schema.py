@@ -0,0 +1,117 @@
+import gzip
+import hashlib
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.views import View
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+FORMATS = {
+    "yaml": ("openapi.yaml", OpenApiYamlRenderer),
+    "json": ("openapi.json", OpenApiJsonRenderer),
+}
+
+_lock = threading.Lock()
+_generated = {}
+_loaded = {}
+
+
+class SchemaFile:
+    """Rendered schema with its gzipped copy and ETag"""
+
+    def __init__(self, content, gzipped=None):
+        self.content = content
+        self.gzipped = gzipped or gzip.compress(content, mtime=0)
+        self.etag = hashlib.sha256(content).hexdigest()[:32]
+
+
+def render_schema():
+    """{format: bytes} of the schema, as `manage.py spectacular` builds it"""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        schema_format: renderer().render(schema, renderer_context={})
+        for schema_format, (_, renderer) in FORMATS.items()
+    }
+
+
+def write_schema(directory):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for schema_format, content in render_schema().items():
+        path = directory / FORMATS[schema_format][0]
+        path.write_bytes(content)
+        Path(f"{path}.gz").write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+        paths.append(path)
+    return paths
+
+
+def _read(path):
+    gzipped = Path(f"{path}.gz")
+    return SchemaFile(
+        path.read_bytes(), gzipped.read_bytes() if gzipped.exists() else None
+    )
+
+
+def get_schema_file(schema_format):
+    """
+    Schema from OPENAPI_SCHEMA_DIR, reloaded when a deploy rewrites the
+    file, or generated once per process when there is no file.
+    """
+    path = Path(settings.OPENAPI_SCHEMA_DIR) / FORMATS[schema_format][0]
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _lock:
+        if mtime is not None:
+            schema_file = _read(path)
+        else:
+            if not _generated:
+                _generated.update(
+                    (name, SchemaFile(content))
+                    for name, content in render_schema().items()
+                )
+            schema_file = _generated[schema_format]
+        _loaded[path] = (mtime, schema_file)
+    return schema_file
+
+
+class CachedSchemaView(View):
+    """
+    Serve the OpenAPI schema (YAML, or JSON with ?format=json) from memory,
+    gzipped when the client accepts it, answering If-None-Match with 304.
+    """
+
+    def get(self, request, *args, **kwargs):
+        schema_format = "json" if request.GET.get("format") == "json" else "yaml"
+        schema_file = get_schema_file(schema_format)
+        gzipped = "gzip" in request.headers.get("Accept-Encoding", "")
+        etag = f'"{schema_file.etag}{"-gzip" if gzipped else ""}"'
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(
+                schema_file.gzipped if gzipped else schema_file.content,
+                content_type=FORMATS[schema_format][1].media_type,
+            )
+            if gzipped:
+                response["Content-Encoding"] = "gzip"
+        response["ETag"] = etag
+        patch_vary_headers(response, ("Accept-Encoding",))
+        patch_cache_control(response, no_cache=True)
+        return response
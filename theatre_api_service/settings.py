@@ -9,10 +9,14 @@ https://docs.djangoproject.com/en/5.0/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
+
+import importlib.util
 import os
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,6 +48,12 @@ INSTALLED_APPS = [
     "user",
 ]
 
+# API_ONLY=1 boots lean API workers: no admin site and no browsable API,
+# so their modules, templates and checks aren't loaded by every worker.
+API_ONLY = os.environ.get("API_ONLY") == "1"
+if API_ONLY:
+    INSTALLED_APPS.remove("django.contrib.admin")
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -85,16 +95,93 @@ DATABASES = {
     }
 }
 
-# DATABASES = {
-#     "default": {
-#         "ENGINE": "django.db.backends.postgresql",
-#         "NAME": os.environ["POSTGRES_DB"],
-#         "USER": os.environ["POSTGRES_USER"],
-#         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
-#         "HOST": os.environ["POSTGRES_HOST"],
-#         "PORT": os.environ["POSTGRES_PORT"],
-#     }
-# }
+if os.environ.get("POSTGRES_DB"):
+    # DB_POOL: "persistent" (default) keeps one connection per worker thread
+    # for DB_CONN_MAX_AGE seconds, "pgbouncer" for transaction pooling in
+    # front of Postgres.
+    DB_POOL = os.environ.get("DB_POOL", "persistent")
+    if DB_POOL not in ("persistent", "pgbouncer"):
+        raise ImproperlyConfigured(
+            f"Unknown DB_POOL {DB_POOL!r}: use persistent or pgbouncer."
+        )
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ["POSTGRES_DB"],
+            "USER": os.environ["POSTGRES_USER"],
+            "PASSWORD": os.environ["POSTGRES_PASSWORD"],
+            "HOST": os.environ["POSTGRES_HOST"],
+            "PORT": os.environ["POSTGRES_PORT"],
+            "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": True,
+            "DISABLE_SERVER_SIDE_CURSORS": DB_POOL == "pgbouncer",
+            "OPTIONS": {},
+        }
+    }
+    if importlib.util.find_spec("psycopg"):
+        # psycopg3 prepares a query server-side once it ran
+        # DB_PREPARE_THRESHOLD times on a connection, so the hot queries
+        # (performance list, seat occupancy, ticket insert) are parsed and
+        # planned once per connection. Transaction pooling can't keep
+        # prepared statements, so they are disabled behind pgbouncer.
+        DATABASES["default"]["OPTIONS"] = {
+            "server_side_binding": True,
+            "prepare_threshold": (
+                None
+                if DB_POOL == "pgbouncer"
+                else int(os.environ.get("DB_PREPARE_THRESHOLD", 2))
+            ),
+        }
+
+# Read replicas: comma-separated hosts for PostgreSQL or file names for SQLite,
+# e.g. DB_REPLICAS=replica.sqlite3. Catalog reads are routed to them by
+# catalog.db_router.ReplicaRouter.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(
+    filter(None, os.environ.get("DB_REPLICAS", "").split(",")), start=1
+):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+    if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+        DATABASES[alias]["NAME"] = BASE_DIR / replica.strip()
+    else:
+        DATABASES[alias]["HOST"] = replica.strip()
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["catalog.db_router.ReplicaRouter"]
+
+# Cache shared by every process: replica pins must be seen by all workers
+# (REDIS_URL=redis://redis:6379/0 in docker-compose). Without it each
+# process keeps its own local memory cache, which only suits a
+# single-process setup.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+
+# Seconds a user's reads stay on the primary after booking (read-your-writes)
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get("DB_REPLICA_STICKY_SECONDS", 10))
+
+# Stored responses of Idempotency-Key requests are replayed for this long.
+IDEMPOTENCY_KEY_TTL_SECONDS = int(
+    os.environ.get("IDEMPOTENCY_KEY_TTL_SECONDS", 24 * 60 * 60)
+)
+
+# A key whose first request hasn't answered within this many seconds (the
+# process died) is taken over by the next retry instead of answering 409.
+IDEMPOTENCY_LEASE_SECONDS = int(os.environ.get("IDEMPOTENCY_LEASE_SECONDS", 60))
+
+# /health/ready reuses its database, cache and migration checks this long.
+HEALTH_CHECK_CACHE_SECONDS = int(os.environ.get("HEALTH_CHECK_CACHE_SECONDS", 5))
+
+# Pub/sub behind the seat availability stream; the default only reaches
+# clients connected to the same process.
+SEAT_EVENTS_BACKEND = os.environ.get(
+    "SEAT_EVENTS_BACKEND", "catalog.seat_events.LocalSeatEventBackend"
+)
 
 
 # Password validation
@@ -144,6 +231,10 @@ MEDIA_ROOT = "/files/media"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "catalog.renderers.ORJSONRenderer",
+        *([] if API_ONLY else ["rest_framework.renderers.BrowsableAPIRenderer"]),
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
         "rest_framework.throttling.AnonRateThrottle",
@@ -168,6 +259,11 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Prebuilt OpenAPI schema files served by /api/schema/, written at deploy by
+# `manage.py build_openapi_schema`; without them each process generates the
+# schema once on first request.
+OPENAPI_SCHEMA_DIR = Path(os.environ.get("OPENAPI_SCHEMA_DIR", BASE_DIR / "schema"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),